@@ -0,0 +1,22 @@
+"""
+initalising the admission module for rate limiting and load shedding
+"""
+
+from .limiter import (
+    AdmissionRejected,
+    acquire_upstream,
+    admit_client,
+    background_upstream,
+    check_backlog,
+)
+from .middleware import AdmissionMiddleware, admission_rejected_handler
+
+__all__ = [
+    "AdmissionRejected",
+    "acquire_upstream",
+    "admit_client",
+    "background_upstream",
+    "check_backlog",
+    "AdmissionMiddleware",
+    "admission_rejected_handler",
+]
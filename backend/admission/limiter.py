@@ -0,0 +1,144 @@
+import math
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+from config import (
+    BACKLOG_RETRY_AFTER_SECONDS,
+    CLIENT_BURST,
+    CLIENT_RATE_LIMIT_PER_MIN,
+    EXTRACTION_BACKLOG_LIMIT,
+    JINA_BURST,
+    JINA_RATE_LIMIT_PER_MIN,
+    PREFETCH_UPSTREAM_RESERVE,
+    RATE_LIMIT_MAX_CLIENTS,
+    YOUTUBE_BURST,
+    YOUTUBE_RATE_LIMIT_PER_MIN,
+)
+from instrumentation.metrics import CallbackGauge, Counter
+from workers import queue_depth
+from .token_bucket import TokenBucket
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed, carries the status code and Retry-After seconds."""
+
+    def __init__(self, status_code: int, retry_after: float, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.detail = detail
+
+
+SHED_REQUESTS = Counter(
+    "findex_admission_rejected_total",
+    "Requests rejected by admission control.",
+    ("reason", "target"),
+)
+
+_upstreams: Dict[str, TokenBucket] = {
+    "youtube": TokenBucket(YOUTUBE_RATE_LIMIT_PER_MIN / 60, YOUTUBE_BURST),
+    "jina": TokenBucket(JINA_RATE_LIMIT_PER_MIN / 60, JINA_BURST),
+}
+_clients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+_clients_lock = threading.Lock()
+
+# tokens the current call must leave in the upstream bucket, set for background work
+_upstream_reserve: ContextVar[float] = ContextVar("upstream_reserve", default=0.0)
+
+
+def _client_bucket(client_id: str) -> TokenBucket:
+    with _clients_lock:
+        bucket = _clients.get(client_id)
+        if bucket is None:
+            bucket = TokenBucket(CLIENT_RATE_LIMIT_PER_MIN / 60, CLIENT_BURST)
+            _clients[client_id] = bucket
+            # an evicted idle client would have refilled to a full bucket anyway
+            while len(_clients) > RATE_LIMIT_MAX_CLIENTS:
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(client_id)
+        return bucket
+
+
+def admit_client(client_id: str) -> None:
+    """Take a token from the client's bucket or raise a 429."""
+    retry_after = _client_bucket(client_id).try_acquire()
+    if retry_after:
+        SHED_REQUESTS.labels("client_rate", "client").inc()
+        raise AdmissionRejected(429, retry_after, "Rate limit exceeded, slow down")
+
+
+@contextmanager
+def background_upstream(reserve: float = PREFETCH_UPSTREAM_RESERVE) -> Iterator[None]:
+    """
+    Mark upstream calls made inside the block as background work. They are
+    rejected once taking a token would leave fewer than `reserve` in the bucket,
+    so background work can never starve interactive requests.
+    """
+    token = _upstream_reserve.set(reserve)
+    try:
+        yield
+    finally:
+        _upstream_reserve.reset(token)
+
+
+def acquire_upstream(upstream: str) -> None:
+    """
+    Take a token from the upstream's bucket or raise a 429.
+    Call it right before each real upstream request, not for cache hits.
+    Inside background_upstream() the reserve is left for interactive requests.
+    """
+    reserve = _upstream_reserve.get()
+    retry_after = _upstreams[upstream].try_acquire(reserve=reserve)
+    if retry_after:
+        SHED_REQUESTS.labels("upstream_reserve" if reserve else "upstream_rate", upstream).inc()
+        raise AdmissionRejected(
+            429, retry_after, f"Too many requests to {upstream}, try again later"
+        )
+
+
+def check_backlog(upstream: str) -> None:
+    """Fail fast with a 503 when the extraction backlog is over its limit."""
+    if EXTRACTION_BACKLOG_LIMIT > 0 and queue_depth() >= EXTRACTION_BACKLOG_LIMIT:
+        SHED_REQUESTS.labels("backlog", upstream).inc()
+        raise AdmissionRejected(
+            503, BACKLOG_RETRY_AFTER_SECONDS, "Server is busy, try again shortly"
+        )
+
+
+def _limits() -> Dict[Tuple[str, ...], float]:
+    limits = {
+        ("client", "rate_per_min"): CLIENT_RATE_LIMIT_PER_MIN,
+        ("client", "burst"): CLIENT_BURST,
+        ("extraction_backlog", "max_queued"): EXTRACTION_BACKLOG_LIMIT,
+    }
+    for name, bucket in _upstreams.items():
+        limits[(name, "rate_per_min")] = bucket.rate * 60
+        limits[(name, "burst")] = bucket.capacity
+    return limits
+
+
+def _available_tokens() -> Dict[Tuple[str, ...], float]:
+    return {(name,): bucket.tokens for name, bucket in _upstreams.items()}
+
+
+RATE_LIMITS = CallbackGauge(
+    "findex_admission_limit",
+    "Configured admission control limits.",
+    _limits,
+    ("target", "limit"),
+)
+UPSTREAM_TOKENS = CallbackGauge(
+    "findex_upstream_tokens_available",
+    "Tokens currently left in each upstream rate limit bucket.",
+    _available_tokens,
+    ("upstream",),
+)
+TRACKED_CLIENTS = CallbackGauge(
+    "findex_admission_tracked_clients",
+    "Clients with a live rate limit bucket.",
+    lambda: {(): len(_clients)},
+)
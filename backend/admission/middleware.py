@@ -0,0 +1,90 @@
+from typing import Optional
+
+from starlette.responses import JSONResponse
+
+from config import API_KEYS
+from .limiter import AdmissionRejected, admit_client, check_backlog
+
+
+# probes, scrapes and admin calls are never shed
+EXEMPT_PREFIXES = ("/health", "/metrics", "/admin", "/docs", "/redoc", "/openapi.json")
+
+# route prefix -> upstream the route may extract from, checked against the worker
+# backlog here. Upstream tokens are spent by the extraction itself, so cache hits
+# and 304s cost nothing.
+UPSTREAM_ROUTES = (
+    # only queues work
+    ("/youtube/prefetch", None),
+    ("/youtube/", "youtube"),
+    ("/ask", "youtube"),
+)
+
+API_KEY_HEADER = b"x-api-key"
+
+
+def client_id(scope) -> str:
+    """
+    Identify the caller by API key when it is one of API_KEYS, otherwise by address.
+    Unknown keys are ignored, a fresh key per request must not mean a fresh bucket.
+    """
+    for name, value in scope["headers"]:
+        if name == API_KEY_HEADER and value:
+            key = value.decode("latin-1")
+            if key in API_KEYS:
+                return "key:" + key
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+def _upstream_for(path: str) -> Optional[str]:
+    for prefix, upstream in UPSTREAM_ROUTES:
+        if path.startswith(prefix):
+            return upstream
+    return None
+
+
+def rejection_response(exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(
+        {"detail": exc.detail},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def admission_rejected_handler(request, exc: AdmissionRejected) -> JSONResponse:
+    """FastAPI exception handler for rejections raised deeper in the stack."""
+    return rejection_response(exc)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that sheds load before any work is scheduled.
+    Every request spends a token from its client's bucket. Requests to
+    extraction routes are also rejected with a 503 when the worker backlog
+    is over EXTRACTION_BACKLOG_LIMIT. Upstream buckets are charged per real
+    upstream call, see acquire_upstream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"].startswith(EXEMPT_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            admit_client(client_id(scope))
+            upstream = _upstream_for(scope["path"])
+            if upstream:
+                check_backlog(upstream)
+
+        except AdmissionRejected as e:
+            await rejection_response(e)(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,178 @@
+"""
+Serialization benchmark for large transcript responses.
+
+A YTVideoInfo with a transcript of each size is returned through every response
+path of a small FastAPI app and the request is served directly over ASGI.
+Median time and peak traced memory (tracemalloc, measured in a separate run)
+are reported per path. The body is counted and dropped, not kept. Speedup is
+against jsonable_encoder, the path the routes used before FastJSONResponse.
+
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --sizes 0.5,2,8 --repeat 7
+
+paths:
+    jsonable_encoder  JSONResponse(jsonable_encoder(model)), the stdlib json path the
+                      routes used before (baseline)
+    response_model    route returns the model, FastAPI validates and encodes it, for reference
+    fast              FastJSONResponse, native encoder and no revalidation
+    streamed          streamed_json, the transcript is encoded a chunk at a time
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from http_utils import FastJSONResponse, streamed_json  # noqa: E402
+from http_utils.json_response import orjson  # noqa: E402
+from models import YTVideoInfo  # noqa: E402
+
+
+_WORDS = "the video explains how rockets reach orbit and what that costs in fuel".split()
+
+
+def make_video_info(transcript_chars: int) -> YTVideoInfo:
+    rng = random.Random(transcript_chars)
+    lines = []
+    size = 0
+    while size < transcript_chars:
+        line = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 14)))
+        lines.append(line)
+        size += len(line) + 1
+    return YTVideoInfo(
+        title="Benchmark video",
+        description="A video used to benchmark serialization. " * 20,
+        duration=3 * 3600,
+        uploader="FindexAI",
+        tags=["benchmark", "serialization"],
+        transcript="\n".join(lines)[:transcript_chars],
+    )
+
+
+def build_app(video_info: YTVideoInfo) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/response_model", response_model=YTVideoInfo)
+    async def response_model():
+        return video_info
+
+    @app.get("/jsonable_encoder")
+    async def stdlib_json():
+        return JSONResponse(jsonable_encoder(video_info))
+
+    @app.get("/fast")
+    async def fast():
+        return FastJSONResponse(video_info)
+
+    @app.get("/streamed")
+    async def streamed():
+        response, _ = streamed_json(video_info, ("transcript",))
+        return response
+
+    return app
+
+
+async def serve_once(app: FastAPI, path: str) -> int:
+    received = 0
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+
+    request_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            # streaming responses listen for a disconnect until they finish
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal received
+        if message["type"] == "http.response.body":
+            received += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return received
+
+
+def measure(run: Callable[[], int], repeat: int) -> Dict:
+    run()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body_bytes = run()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    run()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "peak_mib": peak / (1024 * 1024),
+        "body_bytes": body_bytes,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", default="0.1,1,5,20", help="transcript sizes in millions of characters"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--paths", default="jsonable_encoder,response_model,fast,streamed"
+    )
+    args = parser.parse_args()
+
+    print(f"native encoder: {'orjson' if orjson is not None else 'pydantic-core'}")
+    print(f"{'transcript':>12}  {'path':<18}{'median':>10}{'peak mem':>12}{'speedup':>9}")
+    for size in (float(value) for value in args.sizes.split(",")):
+        chars = int(size * 1_000_000)
+        app = build_app(make_video_info(chars))
+        baseline_ms = None
+        for path in args.paths.split(","):
+            result = measure(lambda: asyncio.run(serve_once(app, "/" + path)), args.repeat)
+            if path == "jsonable_encoder" or baseline_ms is None:
+                baseline_ms = result["median_ms"]
+            print(
+                f"{chars:>10,}ch  {path:<18}"
+                f"{result['median_ms']:>8.1f}ms"
+                f"{result['peak_mib']:>9.1f}MiB"
+                f"{baseline_ms / result['median_ms']:>8.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Cold start benchmark for the service entry points.
+
+Each entry point is started in a fresh interpreter, which imports the app and
+serves one GET /health/ request directly over ASGI. Import time, first request
+latency and total process time are reported, and the run fails if any entry
+point is over budget or pulls in a heavy dependency at import.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --import-budget-ms 800 --repeat 5 services.health:app
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_ENTRYPOINTS = [
+    "main:app",
+    "services.health:app",
+    "services.youtube:app",
+    "services.ask:app",
+    "services.admin:app",
+]
+
+# subsystems that must only load on first use
+HEAVY_MODULES = ["yt_dlp", "langchain", "bs4", "html2text", "requests"]
+
+_CHILD = """
+import asyncio, importlib, json, sys, time
+
+start = time.perf_counter()
+module_name, attr = sys.argv[1].split(":")
+app = getattr(importlib.import_module(module_name), attr)
+imported = time.perf_counter()
+
+
+async def first_request():
+    messages = []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/health/",
+        "raw_path": b"/health/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+
+status = asyncio.run(first_request())
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (done - imported) * 1000,
+    "status": status,
+    "heavy_modules": [m for m in sys.argv[2:] if m in sys.modules],
+}))
+"""
+
+
+def run_once(entrypoint: str) -> Dict:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD, entrypoint, *HEAVY_MODULES],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    total_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"{entrypoint} failed to start:\n{result.stderr}")
+
+    measurement = json.loads(result.stdout.strip().splitlines()[-1])
+    measurement["process_ms"] = total_ms
+    return measurement
+
+
+def benchmark(entrypoint: str, repeat: int) -> Dict:
+    runs = [run_once(entrypoint) for _ in range(repeat)]
+    return {
+        "entrypoint": entrypoint,
+        "import_ms": statistics.median(run["import_ms"] for run in runs),
+        "first_request_ms": statistics.median(run["first_request_ms"] for run in runs),
+        "process_ms": statistics.median(run["process_ms"] for run in runs),
+        "status": runs[-1]["status"],
+        "heavy_modules": sorted({m for run in runs for m in run["heavy_modules"]}),
+    }
+
+
+def check(result: Dict, import_budget_ms: float, first_request_budget_ms: float) -> List[str]:
+    failures = []
+    if result["import_ms"] > import_budget_ms:
+        failures.append(
+            f"import {result['import_ms']:.0f}ms > budget {import_budget_ms:.0f}ms"
+        )
+    if result["first_request_ms"] > first_request_budget_ms:
+        failures.append(
+            f"first request {result['first_request_ms']:.0f}ms > budget {first_request_budget_ms:.0f}ms"
+        )
+    if result["status"] != 200:
+        failures.append(f"health check returned {result['status']}")
+    if result["heavy_modules"]:
+        failures.append(f"imported at startup: {', '.join(result['heavy_modules'])}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("entrypoints", nargs="*", default=DEFAULT_ENTRYPOINTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        default=float(os.getenv("STARTUP_IMPORT_BUDGET_MS", 1500)),
+    )
+    parser.add_argument(
+        "--first-request-budget-ms",
+        type=float,
+        default=float(os.getenv("STARTUP_FIRST_REQUEST_BUDGET_MS", 250)),
+    )
+    args = parser.parse_args()
+
+    print(f"{'entrypoint':<24}{'import':>10}{'first req':>12}{'process':>10}  result")
+    failed = False
+    for entrypoint in args.entrypoints:
+        result = benchmark(entrypoint, args.repeat)
+        failures = check(result, args.import_budget_ms, args.first_request_budget_ms)
+        failed = failed or bool(failures)
+        print(
+            f"{entrypoint:<24}"
+            f"{result['import_ms']:>8.0f}ms"
+            f"{result['first_request_ms']:>10.1f}ms"
+            f"{result['process_ms']:>8.0f}ms"
+            f"  {'; '.join(failures) if failures else 'ok'}"
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
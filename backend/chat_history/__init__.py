@@ -0,0 +1,21 @@
+"""
+initalising the chat_history module, conversations persisted in SQLite
+"""
+
+from .history import get_store, load_context, record_turn
+from .store import (
+    ConversationNotFound,
+    ConversationStore,
+    estimate_tokens,
+    extractive_summary,
+)
+
+__all__ = [
+    "get_store",
+    "load_context",
+    "record_turn",
+    "ConversationNotFound",
+    "ConversationStore",
+    "estimate_tokens",
+    "extractive_summary",
+]
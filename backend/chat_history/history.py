@@ -0,0 +1,61 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from workers import run_blocking
+from .store import ConversationStore
+
+
+# owner of conversations started without a user_id, never matches a real user id
+ANONYMOUS_USER = ""
+
+
+_store: Optional[ConversationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ConversationStore:
+    """The shared conversation store, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConversationStore()
+        return _store
+
+
+async def load_context(
+    user_id: Optional[str],
+    target: str,
+    conversation_id: Optional[str] = None,
+    new_conversation: bool = False,
+) -> Tuple[str, Dict]:
+    """
+    Resolve the conversation for (user, target) and return its id with the
+    token-bounded context window. Without an id the latest conversation is continued,
+    except for anonymous callers, who only continue a conversation id they were given.
+    """
+    owner = user_id or ANONYMOUS_USER
+
+    def load():
+        store = get_store()
+        resolved = conversation_id
+        if not resolved and not new_conversation and user_id:
+            resolved = store.latest_conversation(owner, target)
+        resolved = store.get_or_create(owner, target, resolved)
+        return resolved, store.context_window(resolved, owner)
+
+    return await run_blocking(load)
+
+
+async def record_turn(
+    user_id: Optional[str], conversation_id: str, question: str, answer: str
+) -> None:
+    """Append a question and its answer, compacting older turns when needed."""
+    owner = user_id or ANONYMOUS_USER
+
+    def record():
+        store = get_store()
+        store.add_message(conversation_id, owner, "user", question)
+        store.add_message(conversation_id, owner, "assistant", answer)
+        store.compact(conversation_id)
+
+    await run_blocking(record)
@@ -0,0 +1,273 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from config import (
+    CHAT_COMPACT_TRIGGER_TOKENS,
+    CHAT_CONTEXT_TOKENS,
+    CHAT_DB_PATH,
+    CHAT_SUMMARY_MAX_TOKENS,
+    get_logger,
+)
+from instrumentation import stage
+
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    target TEXT NOT NULL,
+    summary TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_lookup
+    ON conversations (user_id, target, id);
+CREATE INDEX IF NOT EXISTS idx_conversations_recent
+    ON conversations (user_id, target, updated_at);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id TEXT NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    compacted INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_window
+    ON messages (conversation_id, compacted, id);
+"""
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token for English text."""
+    return max(1, len(text) // 4)
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """Cut text to about `tokens` tokens, marking the cut."""
+    if estimate_tokens(text) <= tokens:
+        return text
+    return text[: tokens * 4].rstrip() + " …"
+
+
+class ConversationNotFound(LookupError):
+    """The conversation does not exist or belongs to another user."""
+
+
+def extractive_summary(previous: str, messages: List[Dict]) -> str:
+    """
+    Fold turns into the running summary by keeping the first sentence of each,
+    then drop the oldest lines until it fits CHAT_SUMMARY_MAX_TOKENS.
+    """
+    lines = previous.splitlines() if previous else []
+    for message in messages:
+        first_sentence = _SENTENCE_END.split(message["content"].strip(), 1)[0]
+        lines.append(f"{message['role']}: {first_sentence[:200]}")
+
+    while len(lines) > 1 and estimate_tokens("\n".join(lines)) > CHAT_SUMMARY_MAX_TOKENS:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+class ConversationStore:
+    """
+    Conversations and their messages in SQLite (WAL mode).
+    Each thread gets its own connection, so the store is safe to use from the
+    worker pool. Methods are blocking, call them through run_blocking.
+    """
+
+    def __init__(
+        self,
+        path: str = CHAT_DB_PATH,
+        summarizer: Callable[[str, List[Dict]], str] = extractive_summary,
+    ):
+        self.path = path
+        self.summarizer = summarizer
+        self._local = threading.local()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+        return connection
+
+    def get_or_create(
+        self, user_id: str, target: str, conversation_id: Optional[str] = None
+    ) -> str:
+        """
+        Return conversation_id if it belongs to (user, target), otherwise start a new
+        conversation. Ids are always generated here, an unknown or foreign id is ignored.
+        """
+        connection = self._connection()
+        if conversation_id:
+            row = connection.execute(
+                "SELECT id FROM conversations WHERE user_id = ? AND target = ? AND id = ?",
+                (user_id, target, conversation_id),
+            ).fetchone()
+            if row:
+                return row["id"]
+            logger.info(f"Ignoring conversation id not owned by {user_id} for {target}")
+
+        now = time.time()
+        conversation_id = uuid.uuid4().hex
+        connection.execute(
+            "INSERT INTO conversations (id, user_id, target, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (conversation_id, user_id, target, now, now),
+        )
+        return conversation_id
+
+    def latest_conversation(self, user_id: str, target: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT id FROM conversations WHERE user_id = ? AND target = ? "
+            "ORDER BY updated_at DESC LIMIT 1",
+            (user_id, target),
+        ).fetchone()
+        return row["id"] if row else None
+
+    def add_message(self, conversation_id: str, user_id: str, role: str, content: str) -> None:
+        """Append a message, raises ConversationNotFound unless the user owns the conversation."""
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            inserted = connection.execute(
+                "INSERT INTO messages (conversation_id, role, content, tokens, created_at) "
+                "SELECT id, ?, ?, ?, ? FROM conversations WHERE id = ? AND user_id = ?",
+                (role, content, estimate_tokens(content), now, conversation_id, user_id),
+            ).rowcount
+            if not inserted:
+                raise ConversationNotFound(conversation_id)
+            connection.execute(
+                "UPDATE conversations SET updated_at = ? WHERE id = ?",
+                (now, conversation_id),
+            )
+            connection.execute("COMMIT")
+
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def context_window(
+        self, conversation_id: str, user_id: str, budget: int = CHAT_CONTEXT_TOKENS
+    ) -> Dict:
+        """
+        The running summary plus as many of the newest turns as fit in the token budget,
+        oldest first. A single message is cut to a quarter of the budget, so one long
+        answer cannot crowd out the rest of the conversation.
+        Raises ConversationNotFound unless the user owns the conversation.
+        """
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT summary FROM conversations WHERE id = ? AND user_id = ?",
+            (conversation_id, user_id),
+        ).fetchone()
+        if row is None:
+            raise ConversationNotFound(conversation_id)
+        summary = row["summary"]
+        used = estimate_tokens(summary) if summary else 0
+        message_cap = max(1, budget // 4)
+
+        messages = []
+        cursor = connection.execute(
+            "SELECT role, content, tokens FROM messages "
+            "WHERE conversation_id = ? AND compacted = 0 ORDER BY id DESC",
+            (conversation_id,),
+        )
+        for message in cursor:
+            tokens = min(message["tokens"], message_cap)
+            if used + tokens > budget:
+                break
+            used += tokens
+            messages.append(
+                {
+                    "role": message["role"],
+                    "content": truncate_to_tokens(message["content"], message_cap),
+                }
+            )
+        cursor.close()
+
+        messages.reverse()
+        return {
+            "summary": summary,
+            "messages": messages,
+            "tokens": used,
+        }
+
+    def compact(
+        self,
+        conversation_id: str,
+        trigger: int = CHAT_COMPACT_TRIGGER_TOKENS,
+        keep: int = CHAT_CONTEXT_TOKENS // 2,
+    ) -> bool:
+        """
+        Once the uncompacted turns exceed `trigger` tokens, fold all but the newest
+        `keep` tokens of them into the conversation summary. Returns True if it compacted.
+        """
+        connection = self._connection()
+        # read and write under one write lock, so two turns finishing at once
+        # cannot both fold the same rows and overwrite each other's summary
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows = connection.execute(
+                "SELECT id, role, content, tokens FROM messages "
+                "WHERE conversation_id = ? AND compacted = 0 ORDER BY id",
+                (conversation_id,),
+            ).fetchall()
+            if sum(row["tokens"] for row in rows) <= trigger:
+                connection.execute("COMMIT")
+                return False
+
+            kept = 0
+            split = len(rows)
+            while split > 0 and kept + rows[split - 1]["tokens"] <= keep:
+                split -= 1
+                kept += rows[split]["tokens"]
+            older = rows[:split]
+            if not older:
+                connection.execute("COMMIT")
+                return False
+
+            with stage("history_compaction"):
+                previous = connection.execute(
+                    "SELECT summary FROM conversations WHERE id = ?", (conversation_id,)
+                ).fetchone()["summary"]
+                summary = self.summarizer(
+                    previous,
+                    [{"role": row["role"], "content": row["content"]} for row in older],
+                )
+                connection.execute(
+                    "UPDATE conversations SET summary = ? WHERE id = ?",
+                    (summary, conversation_id),
+                )
+                connection.execute(
+                    "UPDATE messages SET compacted = 1 "
+                    "WHERE conversation_id = ? AND compacted = 0 AND id <= ?",
+                    (conversation_id, older[-1]["id"]),
+                )
+            connection.execute("COMMIT")
+
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        logger.info(f"Compacted {len(older)} turns of conversation {conversation_id}")
+        return True
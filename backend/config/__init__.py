@@ -3,11 +3,55 @@ initalised the config module
 """
 
 from . import configeration as c
+from .lazy import lazy_getattr
 
 DEV_ENV = c.DEV_ENV
 DEBUG = c.DEBUG
 BACKEND_HOST = c.BACKEND_HOST
 BACKEND_PORT = c.BACKEND_PORT
+DOC_STORE_DIR = c.DOC_STORE_DIR
+DOC_STORE_MAX_BYTES = c.DOC_STORE_MAX_BYTES
+DOC_PAGE_CACHE_BYTES = c.DOC_PAGE_CACHE_BYTES
+EXECUTOR_MAX_WORKERS = c.EXECUTOR_MAX_WORKERS
+PREFETCH_MAX_WORKERS = c.PREFETCH_MAX_WORKERS
+PREFETCH_MAX_PENDING = c.PREFETCH_MAX_PENDING
+PREFETCH_DEDUP_SECONDS = c.PREFETCH_DEDUP_SECONDS
+PREFETCH_UPSTREAM_RESERVE = c.PREFETCH_UPSTREAM_RESERVE
+PROFILE_SAMPLE_RATE = c.PROFILE_SAMPLE_RATE
+PROFILE_INTERVAL_MS = c.PROFILE_INTERVAL_MS
+PROFILE_STORE_SIZE = c.PROFILE_STORE_SIZE
+SLOW_REQUEST_MS = c.SLOW_REQUEST_MS
+ADMIN_TOKEN = c.ADMIN_TOKEN
+CLIENT_RATE_LIMIT_PER_MIN = c.CLIENT_RATE_LIMIT_PER_MIN
+CLIENT_BURST = c.CLIENT_BURST
+RATE_LIMIT_MAX_CLIENTS = c.RATE_LIMIT_MAX_CLIENTS
+API_KEYS = c.API_KEYS
+YOUTUBE_RATE_LIMIT_PER_MIN = c.YOUTUBE_RATE_LIMIT_PER_MIN
+YOUTUBE_BURST = c.YOUTUBE_BURST
+JINA_RATE_LIMIT_PER_MIN = c.JINA_RATE_LIMIT_PER_MIN
+JINA_BURST = c.JINA_BURST
+EXTRACTION_BACKLOG_LIMIT = c.EXTRACTION_BACKLOG_LIMIT
+BACKLOG_RETRY_AFTER_SECONDS = c.BACKLOG_RETRY_AFTER_SECONDS
+JINA_BASE_URL = c.JINA_BASE_URL
+YOUTUBE_UPSTREAM_URL = c.YOUTUBE_UPSTREAM_URL
+UPSTREAM_TIMEOUT_SECONDS = c.UPSTREAM_TIMEOUT_SECONDS
+RETRY_ATTEMPTS = c.RETRY_ATTEMPTS
+RETRY_BASE_DELAY_SECONDS = c.RETRY_BASE_DELAY_SECONDS
+RETRY_MAX_DELAY_SECONDS = c.RETRY_MAX_DELAY_SECONDS
+BREAKER_FAILURE_THRESHOLD = c.BREAKER_FAILURE_THRESHOLD
+BREAKER_RESET_SECONDS = c.BREAKER_RESET_SECONDS
+STALE_CACHE_MAX_ENTRIES = c.STALE_CACHE_MAX_ENTRIES
+VIDEO_INFO_FRESH_SECONDS = c.VIDEO_INFO_FRESH_SECONDS
+TRANSCRIPT_FRESH_SECONDS = c.TRANSCRIPT_FRESH_SECONDS
+MARKDOWN_FRESH_SECONDS = c.MARKDOWN_FRESH_SECONDS
+COMPRESSION_MIN_BYTES = c.COMPRESSION_MIN_BYTES
+GZIP_LEVEL = c.GZIP_LEVEL
+BROTLI_QUALITY = c.BROTLI_QUALITY
+JSON_STREAM_MIN_CHARS = c.JSON_STREAM_MIN_CHARS
+CHAT_DB_PATH = c.CHAT_DB_PATH
+CHAT_CONTEXT_TOKENS = c.CHAT_CONTEXT_TOKENS
+CHAT_COMPACT_TRIGGER_TOKENS = c.CHAT_COMPACT_TRIGGER_TOKENS
+CHAT_SUMMARY_MAX_TOKENS = c.CHAT_SUMMARY_MAX_TOKENS
 logger = c.logger
 get_logger = c.get_logger
 
@@ -16,6 +60,50 @@ __all__ = [
     "DEBUG",
     "BACKEND_HOST",
     "BACKEND_PORT",
+    "DOC_STORE_DIR",
+    "DOC_STORE_MAX_BYTES",
+    "DOC_PAGE_CACHE_BYTES",
+    "EXECUTOR_MAX_WORKERS",
+    "PREFETCH_MAX_WORKERS",
+    "PREFETCH_MAX_PENDING",
+    "PREFETCH_DEDUP_SECONDS",
+    "PREFETCH_UPSTREAM_RESERVE",
+    "PROFILE_SAMPLE_RATE",
+    "PROFILE_INTERVAL_MS",
+    "PROFILE_STORE_SIZE",
+    "SLOW_REQUEST_MS",
+    "ADMIN_TOKEN",
+    "CLIENT_RATE_LIMIT_PER_MIN",
+    "CLIENT_BURST",
+    "RATE_LIMIT_MAX_CLIENTS",
+    "API_KEYS",
+    "YOUTUBE_RATE_LIMIT_PER_MIN",
+    "YOUTUBE_BURST",
+    "JINA_RATE_LIMIT_PER_MIN",
+    "JINA_BURST",
+    "EXTRACTION_BACKLOG_LIMIT",
+    "BACKLOG_RETRY_AFTER_SECONDS",
+    "JINA_BASE_URL",
+    "YOUTUBE_UPSTREAM_URL",
+    "UPSTREAM_TIMEOUT_SECONDS",
+    "RETRY_ATTEMPTS",
+    "RETRY_BASE_DELAY_SECONDS",
+    "RETRY_MAX_DELAY_SECONDS",
+    "BREAKER_FAILURE_THRESHOLD",
+    "BREAKER_RESET_SECONDS",
+    "STALE_CACHE_MAX_ENTRIES",
+    "VIDEO_INFO_FRESH_SECONDS",
+    "TRANSCRIPT_FRESH_SECONDS",
+    "MARKDOWN_FRESH_SECONDS",
+    "COMPRESSION_MIN_BYTES",
+    "GZIP_LEVEL",
+    "BROTLI_QUALITY",
+    "JSON_STREAM_MIN_CHARS",
+    "CHAT_DB_PATH",
+    "CHAT_CONTEXT_TOKENS",
+    "CHAT_COMPACT_TRIGGER_TOKENS",
+    "CHAT_SUMMARY_MAX_TOKENS",
     "logger",
     "get_logger",
+    "lazy_getattr",
 ]
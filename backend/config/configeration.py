@@ -10,6 +10,87 @@ DEBUG = os.getenv("DEBUG", True if DEV_ENV == "development" else False)
 BACKEND_HOST = os.getenv("BACKEND_HOST", "0.0.0.0")
 BACKEND_PORT = int(os.getenv("BACKEND_PORT", 5454))
 
+# content-addressed store for parsed uploads
+DOC_STORE_DIR = os.getenv(
+    "DOC_STORE_DIR",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "doc_analyser",
+        "doc_store",
+    ),
+)
+DOC_STORE_MAX_BYTES = int(os.getenv("DOC_STORE_MAX_BYTES", 512 * 1024 * 1024))
+
+# resident memory budget for decoded document pages
+DOC_PAGE_CACHE_BYTES = int(os.getenv("DOC_PAGE_CACHE_BYTES", 64 * 1024 * 1024))
+
+# worker threads for blocking upstream and parsing calls
+EXECUTOR_MAX_WORKERS = int(os.getenv("EXECUTOR_MAX_WORKERS", 8))
+
+# prefetch, background work shares the pool but never holds more than PREFETCH_MAX_WORKERS
+PREFETCH_MAX_WORKERS = int(os.getenv("PREFETCH_MAX_WORKERS", 2))
+PREFETCH_MAX_PENDING = int(os.getenv("PREFETCH_MAX_PENDING", 64))
+PREFETCH_DEDUP_SECONDS = float(os.getenv("PREFETCH_DEDUP_SECONDS", 10 * 60))
+# upstream tokens background work leaves in each bucket for interactive requests
+PREFETCH_UPSTREAM_RESERVE = float(os.getenv("PREFETCH_UPSTREAM_RESERVE", 10))
+
+# request profiling
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0.0))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 5))
+PROFILE_STORE_SIZE = int(os.getenv("PROFILE_STORE_SIZE", 50))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 5000))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# admission control, limits are per minute with a burst allowance, 0 disables
+CLIENT_RATE_LIMIT_PER_MIN = float(os.getenv("CLIENT_RATE_LIMIT_PER_MIN", 60))
+CLIENT_BURST = int(os.getenv("CLIENT_BURST", 20))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", 10000))
+# comma separated X-API-Key values that get a bucket of their own, others are limited by address
+API_KEYS = frozenset(key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip())
+YOUTUBE_RATE_LIMIT_PER_MIN = float(os.getenv("YOUTUBE_RATE_LIMIT_PER_MIN", 120))
+YOUTUBE_BURST = int(os.getenv("YOUTUBE_BURST", 30))
+JINA_RATE_LIMIT_PER_MIN = float(os.getenv("JINA_RATE_LIMIT_PER_MIN", 60))
+JINA_BURST = int(os.getenv("JINA_BURST", 20))
+EXTRACTION_BACKLOG_LIMIT = int(os.getenv("EXTRACTION_BACKLOG_LIMIT", 32))
+BACKLOG_RETRY_AFTER_SECONDS = int(os.getenv("BACKLOG_RETRY_AFTER_SECONDS", 5))
+
+# upstream endpoints, point these at loadtest/fake_upstream.py to load test offline
+JINA_BASE_URL = os.getenv("JINA_BASE_URL", "https://r.jina.ai/")
+YOUTUBE_UPSTREAM_URL = os.getenv("YOUTUBE_UPSTREAM_URL", "")
+
+# upstream resilience
+UPSTREAM_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", 15))
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", 3))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", 0.5))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", 8))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", 5))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", 30))
+STALE_CACHE_MAX_ENTRIES = int(os.getenv("STALE_CACHE_MAX_ENTRIES", 256))
+VIDEO_INFO_FRESH_SECONDS = float(os.getenv("VIDEO_INFO_FRESH_SECONDS", 15 * 60))
+TRANSCRIPT_FRESH_SECONDS = float(os.getenv("TRANSCRIPT_FRESH_SECONDS", 24 * 60 * 60))
+MARKDOWN_FRESH_SECONDS = float(os.getenv("MARKDOWN_FRESH_SECONDS", 60 * 60))
+
+# response compression, brotli is used when the package is installed
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 5))
+
+# transcripts longer than this are streamed instead of encoded in one piece, 0 disables
+JSON_STREAM_MIN_CHARS = int(os.getenv("JSON_STREAM_MIN_CHARS", 2 * 1024 * 1024))
+
+# chat history
+CHAT_DB_PATH = os.getenv(
+    "CHAT_DB_PATH",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "chat_history",
+        "chat_history.sqlite3",
+    ),
+)
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", 1500))
+CHAT_COMPACT_TRIGGER_TOKENS = int(os.getenv("CHAT_COMPACT_TRIGGER_TOKENS", 3000))
+CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", 400))
+
 # logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
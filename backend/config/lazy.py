@@ -0,0 +1,29 @@
+import importlib
+import sys
+from typing import Callable, Dict, Optional, Tuple
+
+
+def lazy_getattr(
+    package: str, exports: Dict[str, Tuple[str, Optional[str]]]
+) -> Callable[[str], object]:
+    """
+    Build a module level __getattr__ (PEP 562) that imports exports on first access.
+    exports maps a public name to (relative module, attribute), attribute None means
+    the module itself. The resolved value is cached on the package afterwards.
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str):
+        try:
+            module_name, attr = exports[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}"
+            ) from None
+
+        module = importlib.import_module(module_name, package)
+        value = module if attr is None else getattr(module, attr)
+        namespace[name] = value
+        return value
+
+    return __getattr__
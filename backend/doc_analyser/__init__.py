@@ -1,10 +1,35 @@
 """
 initalising the doc_analyser module
+submodules are imported on first use so langchain is not loaded at startup.
 """
 
-from upload_hander import save_uploaded_file, load_uploaded_file
+from config import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "save_uploaded_file": (".upload_hander", "save_uploaded_file"),
+        "load_uploaded_file": (".upload_hander", "load_uploaded_file"),
+        "ingest_uploaded_file": (".upload_hander", "ingest_uploaded_file"),
+        "open_uploaded_file": (".upload_hander", "open_uploaded_file"),
+        "ingest_text": (".text_ingest", "ingest_text"),
+        "open_text": (".text_ingest", "open_text"),
+        "LazyDocument": (".lazy_document", "LazyDocument"),
+        "page_cache": (".lazy_document", "page_cache"),
+        "retrieve": (".retriever", "retrieve"),
+        "doc_store": (".doc_store", None),
+    },
+)
 
 __all__ = [
     "save_uploaded_file",
     "load_uploaded_file",
+    "ingest_uploaded_file",
+    "open_uploaded_file",
+    "ingest_text",
+    "open_text",
+    "LazyDocument",
+    "page_cache",
+    "retrieve",
+    "doc_store",
 ]
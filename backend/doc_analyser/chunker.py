@@ -0,0 +1,19 @@
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from typing import Dict, List
+
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=CHUNK_SIZE,
+    chunk_overlap=CHUNK_OVERLAP,
+)
+
+
+def split_page(text: str, metadata: Dict) -> List[Dict]:
+    """Split a single page into chunks, each carrying the page metadata."""
+    return [
+        {"text": chunk, "metadata": dict(metadata)}
+        for chunk in _splitter.split_text(text)
+    ]
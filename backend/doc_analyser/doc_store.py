@@ -0,0 +1,215 @@
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import zlib
+from typing import Dict, Iterator, List, Optional
+
+from config import DOC_STORE_DIR, DOC_STORE_MAX_BYTES, get_logger
+
+
+logger = get_logger(__name__)
+
+INDEX_FILE = "index.json"
+PAGES_FILE = "pages.bin"
+CHUNKS_FILE = "chunks.jsonl.gz"
+
+# evicted entries are renamed here and only deleted once readers that already
+# opened them have had this long to finish
+TRASH_DIR = os.path.join(DOC_STORE_DIR, ".trash")
+TRASH_GRACE_SECONDS = 300
+
+os.makedirs(TRASH_DIR, exist_ok=True)
+_evict_lock = threading.Lock()
+
+
+class DocumentMissing(FileNotFoundError):
+    """A document is not, or no longer, in the doc store."""
+
+
+def _entry_dir(digest: str) -> str:
+    return os.path.join(DOC_STORE_DIR, digest)
+
+
+def _readable_dir(digest: str) -> str:
+    """
+    Directory to read a document's files from. Falls back to an evicted copy
+    still in the trash, so a reader that raced eviction can finish.
+    """
+    entry_dir = _entry_dir(digest)
+    if os.path.isdir(entry_dir):
+        return entry_dir
+
+    prefix = digest + "."
+    for name in sorted(os.listdir(TRASH_DIR), reverse=True):
+        if name.startswith(prefix):
+            return os.path.join(TRASH_DIR, name)
+
+    raise DocumentMissing(f"Document {digest} is not in the doc store")
+
+
+def has_document(digest: str) -> bool:
+    """Check whether a document with the given SHA-256 is already stored."""
+    return os.path.exists(os.path.join(_entry_dir(digest), INDEX_FILE))
+
+
+def read_index(digest: str) -> Optional[Dict]:
+    """Load the page index of a stored document and mark it as recently used."""
+    index_path = os.path.join(_entry_dir(digest), INDEX_FILE)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        os.utime(index_path)
+
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read doc store index for {digest}: {e}")
+        return None
+
+    return index
+
+
+def read_pages(digest: str, index: Dict, start: int, end: int) -> List[str]:
+    """
+    Read and decompress the text of pages [start, end) of a stored document.
+    Raises DocumentMissing if the document was evicted and already deleted.
+    """
+    entries = index["pages"][start:end]
+    if not entries:
+        return []
+
+    texts = []
+    with open(os.path.join(_readable_dir(digest), PAGES_FILE), "rb") as f:
+        for entry in entries:
+            f.seek(entry["offset"])
+            texts.append(zlib.decompress(f.read(entry["length"])).decode("utf-8"))
+
+    return texts
+
+
+def iter_chunks(digest: str) -> Iterator[Dict]:
+    """
+    Yield the derived chunks of a stored document one at a time.
+    Raises DocumentMissing if the document was evicted and already deleted.
+    """
+    with gzip.open(
+        os.path.join(_readable_dir(digest), CHUNKS_FILE), "rt", encoding="utf-8"
+    ) as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _purge_trash() -> None:
+    """Delete evicted entries whose grace period is over."""
+    cutoff = time.time() - TRASH_GRACE_SECONDS
+    for name in os.listdir(TRASH_DIR):
+        trash_dir = os.path.join(TRASH_DIR, name)
+        try:
+            if os.path.getmtime(trash_dir) < cutoff:
+                shutil.rmtree(trash_dir, ignore_errors=True)
+        except OSError:
+            continue
+
+
+def evict_to_limit(keep: Optional[str] = None) -> None:
+    """
+    Drop least recently used documents until the store fits in DOC_STORE_MAX_BYTES.
+    An entry is moved to the trash in one rename, so it is never seen half deleted.
+    """
+    with _evict_lock:
+        _purge_trash()
+
+        entries = []
+        total = 0
+        for name in os.listdir(DOC_STORE_DIR):
+            entry_dir = os.path.join(DOC_STORE_DIR, name)
+            index_path = os.path.join(entry_dir, INDEX_FILE)
+            if name.startswith(".") or not os.path.exists(index_path):
+                continue
+
+            size = sum(
+                os.path.getsize(os.path.join(entry_dir, f_name))
+                for f_name in os.listdir(entry_dir)
+            )
+            entries.append((os.path.getmtime(index_path), size, name))
+            total += size
+
+        entries.sort()
+        for _, size, name in entries:
+            if total <= DOC_STORE_MAX_BYTES:
+                break
+            if name == keep:
+                continue
+
+            trash_dir = os.path.join(TRASH_DIR, f"{name}.{time.time_ns()}")
+            try:
+                os.rename(_entry_dir(name), trash_dir)
+                os.utime(trash_dir)
+            except OSError:
+                continue
+            total -= size
+            logger.info(f"Evicted {name} from doc store ({size} bytes)")
+
+
+class DocumentWriter:
+    """
+    Incrementally writes a parsed document into the store.
+    Pages are zlib-compressed one by one so they can later be read individually,
+    chunks are appended to a gzipped JSON-lines file.
+    The entry only becomes visible once commit() renames it into place.
+    """
+
+    def __init__(self, digest: str, source: str):
+        self.digest = digest
+        self._tmp_dir = os.path.join(
+            DOC_STORE_DIR, f".{digest}.{uuid.uuid4().hex[:8]}.tmp"
+        )
+        os.makedirs(self._tmp_dir)
+
+        self._pages = open(os.path.join(self._tmp_dir, PAGES_FILE), "wb")
+        self._chunks = gzip.open(
+            os.path.join(self._tmp_dir, CHUNKS_FILE), "wt", encoding="utf-8"
+        )
+        self._offset = 0
+        self._index = {
+            "sha256": digest,
+            "source": source,
+            "pages": [],
+        }
+
+    def add_page(self, text: str, metadata: Dict, chunks: List[Dict]) -> None:
+        blob = zlib.compress(text.encode("utf-8"))
+        self._pages.write(blob)
+        self._index["pages"].append(
+            {
+                "offset": self._offset,
+                "length": len(blob),
+                "metadata": metadata,
+            }
+        )
+        self._offset += len(blob)
+
+        for chunk in chunks:
+            self._chunks.write(json.dumps(chunk, separators=(",", ":")) + "\n")
+
+    def commit(self) -> None:
+        self._pages.close()
+        self._chunks.close()
+        with open(os.path.join(self._tmp_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+            json.dump(self._index, f, separators=(",", ":"))
+
+        try:
+            os.rename(self._tmp_dir, _entry_dir(self.digest))
+
+        except OSError:
+            # same bytes were stored concurrently, keep the existing entry
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+        evict_to_limit(keep=self.digest)
+
+    def abort(self) -> None:
+        self._pages.close()
+        self._chunks.close()
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
@@ -0,0 +1,146 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
+
+from langchain.schema import Document
+
+from config import DOC_PAGE_CACHE_BYTES, get_logger
+from instrumentation import record_cache
+from . import doc_store
+
+
+logger = get_logger(__name__)
+
+_ITER_BATCH_SIZE = 8
+
+
+class PageCache:
+    """
+    LRU cache of decoded pages shared by every open document.
+    Pages are evicted once their combined size exceeds the byte budget,
+    so the number or size of open documents does not grow resident memory.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self.resident_bytes = 0
+        self._pages: "OrderedDict[Tuple[str, int], Tuple[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str, page: int) -> Optional[str]:
+        with self._lock:
+            entry = self._pages.get((digest, page))
+            if entry is None:
+                return None
+            self._pages.move_to_end((digest, page))
+            return entry[0]
+
+    def put(self, digest: str, page: int, text: str) -> None:
+        size = sys.getsizeof(text)
+        with self._lock:
+            previous = self._pages.pop((digest, page), None)
+            if previous is not None:
+                self.resident_bytes -= previous[1]
+
+            self._pages[(digest, page)] = (text, size)
+            self.resident_bytes += size
+
+            while self.resident_bytes > self.budget_bytes and len(self._pages) > 1:
+                _, (_, evicted_size) = self._pages.popitem(last=False)
+                self.resident_bytes -= evicted_size
+
+
+page_cache = PageCache(DOC_PAGE_CACHE_BYTES)
+
+
+def _runs(pages: List[int]) -> Iterator[Tuple[int, int]]:
+    """Group sorted page numbers into contiguous [first, last) runs."""
+    first = previous = None
+    for page in pages:
+        if previous is not None and page != previous + 1:
+            yield first, previous + 1
+            first = None
+        if first is None:
+            first = page
+        previous = page
+    if first is not None:
+        yield first, previous + 1
+
+
+class LazyDocument:
+    """
+    Random access over the pages of a stored document.
+    Only the page index is loaded up front, page text is decoded on demand
+    and kept in the shared page cache.
+    """
+
+    def __init__(self, digest: str):
+        index = doc_store.read_index(digest)
+        if index is None:
+            raise doc_store.DocumentMissing(f"Document {digest} is not in the doc store")
+
+        self.digest = digest
+        self.source = index.get("source", "")
+        self._entries = index["pages"]
+        self._index = index
+
+    @property
+    def page_count(self) -> int:
+        return len(self._entries)
+
+    def _document(self, page: int, text: str) -> Document:
+        return Document(page_content=text, metadata=self._entries[page]["metadata"])
+
+    def _clamp(self, start: int, end: Optional[int]) -> Tuple[int, int]:
+        # start == page_count is an empty range, so an empty document reads as []
+        if start < 0 or start > self.page_count:
+            raise IndexError(
+                f"Page {start} out of range for document with {self.page_count} pages"
+            )
+        end = self.page_count if end is None else min(end, self.page_count)
+        return start, max(start, end)
+
+    def get_page(self, page: int) -> Document:
+        """Return a single page."""
+        if not 0 <= page < self.page_count:
+            raise IndexError(
+                f"Page {page} out of range for document with {self.page_count} pages"
+            )
+        return self.get_pages(page, page + 1)[0]
+
+    def get_pages(self, start: int, end: Optional[int] = None) -> List[Document]:
+        """Return pages [start, end), decoding only those not already resident."""
+        start, end = self._clamp(start, end)
+
+        texts = {}
+        missing = []
+        for page in range(start, end):
+            text = page_cache.get(self.digest, page)
+            record_cache("page_cache", text is not None)
+            if text is None:
+                missing.append(page)
+            else:
+                texts[page] = text
+
+        for first, last in _runs(missing):
+            decoded = doc_store.read_pages(self.digest, self._index, first, last)
+            for page, text in zip(range(first, last), decoded):
+                texts[page] = text
+                page_cache.put(self.digest, page, text)
+
+        return [self._document(page, texts[page]) for page in range(start, end)]
+
+    def iter_pages(self, start: int = 0, end: Optional[int] = None) -> Iterator[Document]:
+        """Yield pages [start, end) a small batch at a time."""
+        start, end = self._clamp(start, end)
+        for batch_start in range(start, end, _ITER_BATCH_SIZE):
+            yield from self.get_pages(batch_start, min(batch_start + _ITER_BATCH_SIZE, end))
+
+    def iter_chunks(self, start: int = 0, end: Optional[int] = None) -> Iterator[Document]:
+        """Yield the stored chunks belonging to pages [start, end)."""
+        end = self.page_count if end is None else end
+        for chunk in doc_store.iter_chunks(self.digest):
+            page = chunk["metadata"].get("page", 0)
+            if start <= page < end:
+                yield Document(page_content=chunk["text"], metadata=chunk["metadata"])
@@ -0,0 +1,47 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from langchain.schema import Document
+
+from instrumentation import stage
+from .lazy_document import LazyDocument
+
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def score_chunk(query_terms: Iterable[str], text: str) -> float:
+    """Lexical relevance of a chunk: log-scaled frequency of each query term."""
+    counts = Counter(_tokens(text))
+    return sum(1 + math.log(counts[term]) for term in query_terms if counts[term])
+
+
+def retrieve(
+    document: LazyDocument,
+    question: str,
+    k: int = 4,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> List[Document]:
+    """
+    Return the k chunks of pages [start, end) most relevant to the question.
+    Chunks are streamed from the store, so only the current top k are held.
+    """
+    query_terms = set(_tokens(question))
+    if not query_terms:
+        return []
+
+    with stage("retrieval"):
+        scored = (
+            (score_chunk(query_terms, chunk.page_content), chunk)
+            for chunk in document.iter_chunks(start, end)
+        )
+        best = heapq.nlargest(k, scored, key=lambda item: item[0])
+    return [chunk for score, chunk in best if score > 0]
@@ -0,0 +1,66 @@
+import hashlib
+from typing import Iterator
+
+from config import get_logger
+from instrumentation import record_cache, stage
+from . import doc_store
+from .chunker import split_page
+from .lazy_document import LazyDocument
+
+
+logger = get_logger(__name__)
+
+# plain text has no pages of its own, it is stored in pages of about this many characters
+TEXT_PAGE_CHARS = 4000
+
+
+def _text_pages(text: str) -> Iterator[str]:
+    """Cut text into pages of about TEXT_PAGE_CHARS, breaking at line ends."""
+    page = []
+    size = 0
+    for line in text.splitlines(keepends=True):
+        if size and size + len(line) > TEXT_PAGE_CHARS:
+            yield "".join(page)
+            page, size = [], 0
+        page.append(line)
+        size += len(line)
+    if page:
+        yield "".join(page)
+
+
+def ingest_text(text: str, source: str) -> str:
+    """
+    Store text such as a cleaned transcript in the document store, with its
+    retrieval chunks, unless the same text was stored before. Returns its digest.
+    """
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    hit = doc_store.has_document(digest)
+    record_cache("doc_store", hit)
+    if hit:
+        return digest
+
+    logger.info(f"Doc store miss for {source} ({digest}), indexing")
+    writer = doc_store.DocumentWriter(digest, source)
+    try:
+        with stage("text_index"):
+            for page, page_text in enumerate(_text_pages(text)):
+                metadata = {"source": source, "page": page}
+                writer.add_page(page_text, metadata, split_page(page_text, metadata))
+
+    except Exception:
+        writer.abort()
+        raise
+
+    writer.commit()
+    return digest
+
+
+def open_text(text: str, source: str) -> LazyDocument:
+    """Index text if needed and return a lazy view over it for retrieval."""
+    digest = ingest_text(text, source)
+    try:
+        return LazyDocument(digest)
+    except doc_store.DocumentMissing:
+        # evicted between the hit and opening it, treat it as a miss
+        return LazyDocument(ingest_text(text, source))
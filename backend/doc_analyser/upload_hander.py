@@ -1,17 +1,29 @@
 from langchain.document_loaders import PyPDFLoader
+from langchain.schema import Document
+import hashlib
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import uuid
 import time
 
+from config import get_logger
+from instrumentation import record_cache, stage
+from . import doc_store
+from .chunker import split_page
+from .lazy_document import LazyDocument
+
 temp_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp_docs")
 os.makedirs(temp_dir, exist_ok=True)
 
+logger = get_logger(__name__)
 
-def save_uploaded_file(uploaded_file, filename: Optional[str] = None) -> str:
+_READ_BLOCK_SIZE = 1024 * 1024
+
+
+def _stream_to_disk(uploaded_file, filename: Optional[str] = None) -> Tuple[str, str]:
     """
-    Saves an uploaded file (from an API request) to the temp_dir and returns the saved file path.
-    If filename is not provided, a unique one will be generated.
+    Writes an uploaded file to the temp_dir in blocks, hashing the bytes as they stream.
+    Returns the saved file path and the SHA-256 hex digest of its content.
     """
     if not filename:
         # Attempt to get original filename and extension
@@ -28,26 +40,101 @@ def save_uploaded_file(uploaded_file, filename: Optional[str] = None) -> str:
         filename = f"{safe_name}_{timestamp}_{unique_id}{ext if ext else '.dat'}"
 
     file_path = os.path.join(temp_dir, filename)
+    sha256 = hashlib.sha256()
     with open(file_path, "wb") as f:
-        f.write(uploaded_file.read())
+        while True:
+            block = uploaded_file.read(_READ_BLOCK_SIZE)
+            if not block:
+                break
+            sha256.update(block)
+            f.write(block)
+
+    return file_path, sha256.hexdigest()
 
+
+def save_uploaded_file(uploaded_file, filename: Optional[str] = None) -> str:
+    """
+    Saves an uploaded file (from an API request) to the temp_dir and returns the saved file path.
+    If filename is not provided, a unique one will be generated.
+    """
+    file_path, _ = _stream_to_disk(uploaded_file, filename)
     return file_path
 
 
-def load_uploaded_file(uploaded_file, filename: Optional[str] = None):
+def _ingest_path(file_path: str, digest: str, source: str) -> None:
+    """Parse a saved upload into the document store unless it is already there."""
+    hit = doc_store.has_document(digest)
+    record_cache("doc_store", hit)
+    if hit:
+        logger.info(f"Doc store hit for {source} ({digest})")
+        return
+
+    logger.info(f"Doc store miss for {source} ({digest}), parsing")
+    writer = doc_store.DocumentWriter(digest, source)
+    try:
+        with stage("pdf_parse"):
+            loader = PyPDFLoader(file_path)
+            for page in loader.lazy_load():
+                metadata = {**page.metadata, "source": source}
+                writer.add_page(
+                    page.page_content,
+                    metadata,
+                    split_page(page.page_content, metadata),
+                )
+
+    except Exception:
+        writer.abort()
+        raise
+
+    writer.commit()
+
+
+def ingest_uploaded_file(uploaded_file, filename: Optional[str] = None) -> str:
     """
-    Handles an uploaded file: saves it, loads its content using PyPDFLoader,
-    and deletes the file after loading.
-    If filename is not provided, a unique one will be generated during save.
+    Handles an uploaded file: hashes it while saving, and parses it into the
+    document store unless the same bytes were stored before.
+    The temp file is always deleted. Returns the SHA-256 digest of the upload.
     """
-    file_path = save_uploaded_file(uploaded_file, filename)
+    file_path, digest = _stream_to_disk(uploaded_file, filename)
+    source = getattr(uploaded_file, "name", None) or os.path.basename(file_path)
 
     try:
-        loader = PyPDFLoader(file_path)
-        docs = loader.load()
+        _ingest_path(file_path, digest, source)
 
     finally:
         if os.path.exists(file_path):
             os.remove(file_path)
 
-    return docs
+    return digest
+
+
+def open_uploaded_file(uploaded_file, filename: Optional[str] = None) -> LazyDocument:
+    """
+    Handles an uploaded file and returns a lazy view over its pages.
+    Page text is only decoded when a page range is requested.
+    """
+    file_path, digest = _stream_to_disk(uploaded_file, filename)
+    source = getattr(uploaded_file, "name", None) or os.path.basename(file_path)
+
+    try:
+        _ingest_path(file_path, digest, source)
+        try:
+            return LazyDocument(digest)
+        except doc_store.DocumentMissing:
+            # evicted between the hit and opening it, treat it as a miss
+            _ingest_path(file_path, digest, source)
+            return LazyDocument(digest)
+
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def load_uploaded_file(uploaded_file, filename: Optional[str] = None) -> List[Document]:
+    """
+    Handles an uploaded file and returns all of its pages as documents.
+    Repeat uploads are answered from the document store without re-parsing.
+    If filename is not provided, a unique one will be generated during save.
+    Prefer open_uploaded_file for large documents.
+    """
+    return list(open_uploaded_file(uploaded_file, filename).iter_pages())
@@ -0,0 +1,17 @@
+"""
+initalising the http_utils module for conditional and compressed responses
+"""
+
+from .compression import CompressionMiddleware
+from .etag import conditional_json, etag_matches, strong_etag
+from .json_response import FastJSONResponse, render_json, streamed_json
+
+__all__ = [
+    "CompressionMiddleware",
+    "conditional_json",
+    "etag_matches",
+    "strong_etag",
+    "FastJSONResponse",
+    "render_json",
+    "streamed_json",
+]
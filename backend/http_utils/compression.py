@@ -0,0 +1,189 @@
+import zlib
+from typing import List, Optional, Tuple
+
+from config import BROTLI_QUALITY, COMPRESSION_MIN_BYTES, GZIP_LEVEL
+from instrumentation.metrics import Counter
+
+
+COMPRESSION_BYTES = Counter(
+    "findex_compression_bytes_total",
+    "Response body bytes before and after compression.",
+    ("encoding", "stage"),
+)
+
+_COMPRESSIBLE_TYPES = (
+    b"application/json",
+    b"application/javascript",
+    b"application/xml",
+    b"text/",
+)
+
+
+def _brotli_available() -> bool:
+    try:
+        import brotli  # noqa: F401  optional, only used when installed
+    except ImportError:
+        return False
+    return True
+
+
+_HAS_BROTLI = _brotli_available()
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br when brotli is installed and accepted, otherwise gzip, otherwise None."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip())
+
+    if _HAS_BROTLI and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class _Encoder:
+    """Incremental gzip or brotli encoder."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            import brotli
+
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that gzip or brotli encodes JSON and text responses.
+    Bodies under COMPRESSION_MIN_BYTES are sent as is. Streamed bodies are
+    encoded chunk by chunk. A strong ETag on an encoded body gets an encoding
+    suffix so it stays strong, etag_matches ignores the suffix. Weak ETags
+    are shared by every encoding and left alone.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = _header(scope["headers"], b"accept-encoding")
+        encoding = negotiate_encoding(accept_encoding.decode("latin-1")) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    __slots__ = ("send", "encoding", "minimum_size", "start", "encoder", "passthrough")
+
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+
+    def _compressible(self) -> bool:
+        headers = self.start.get("headers", [])
+        content_type = _header(headers, b"content-type") or b""
+        return (
+            self.start["status"] not in (204, 304)
+            and _header(headers, b"content-encoding") is None
+            and content_type.startswith(_COMPRESSIBLE_TYPES)
+        )
+
+    def _encoded_headers(self, content_length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+        headers = []
+        for key, value in self.start.get("headers", []):
+            lowered = key.lower()
+            if lowered == b"content-length":
+                continue
+            if lowered == b"etag" and value.endswith(b'"') and not value.startswith(b"W/"):
+                value = value[:-1] + b"-" + self.encoding.encode() + b'"'
+            headers.append((key, value))
+
+        headers.append((b"content-encoding", self.encoding.encode()))
+        headers.append((b"vary", b"Accept-Encoding"))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        return headers
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            if not self._compressible() or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+
+            self.encoder = _Encoder(self.encoding)
+            if not more_body:
+                compressed = self.encoder.compress(body) + self.encoder.finish()
+                self._count(len(body), len(compressed))
+                await self.send(
+                    {**self.start, "headers": self._encoded_headers(len(compressed))}
+                )
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            await self.send({**self.start, "headers": self._encoded_headers(None)})
+
+        compressed = self.encoder.compress(body)
+        if not more_body:
+            compressed += self.encoder.finish()
+        self._count(len(body), len(compressed))
+        await self.send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body}
+        )
+
+    def _count(self, identity: int, encoded: int) -> None:
+        COMPRESSION_BYTES.labels(self.encoding, "identity").inc(identity)
+        COMPRESSION_BYTES.labels(self.encoding, "encoded").inc(encoded)
@@ -0,0 +1,81 @@
+import hashlib
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from config import JSON_STREAM_MIN_CHARS
+from .json_response import FastJSONResponse, field_lengths, streamed_json
+
+
+# the client keeps the body and revalidates it with If-None-Match on every use
+CACHE_CONTROL = "private, no-cache"
+
+# suffixes CompressionMiddleware appends to a strong ETag of an encoded body,
+# still stripped so tags handed out before responses used weak ETags match
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def strong_etag(body: bytes) -> str:
+    """Strong entity tag derived from the exact response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag, as the spec requires."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == current for tag in if_none_match.split(","))
+
+
+def conditional_json(
+    content: Any, if_none_match: Optional[str], stream_fields: Sequence[str] = ()
+) -> Response:
+    """
+    Render content as JSON with an ETag, or a bodyless 304 when the client
+    already holds this content.
+    The ETag is weak, W/ plus the strong tag of the identity body, so the gzip,
+    brotli and identity encodings of a body share one validator and a 304 carries
+    the same ETag as the 200 it revalidates.
+    A model whose `stream_fields` strings (dotted paths, see streamed_json) add
+    up to JSON_STREAM_MIN_CHARS or more is streamed instead of encoded in one piece.
+    Rendering and hashing are CPU bound, call this through run_blocking.
+
+    The lookup routes using this are POST only because their parameters are a
+    JSON body, but they are safe and idempotent. A matching If-None-Match is
+    therefore deliberately answered as for a GET, with 304, where RFC 9110 has
+    other methods fail with 412; a 412 would tell the client its cached copy
+    is unusable when it is in fact current.
+    """
+    headers = {"Cache-Control": CACHE_CONTROL}
+
+    if (
+        stream_fields
+        and JSON_STREAM_MIN_CHARS > 0
+        and isinstance(content, BaseModel)
+        and field_lengths(content, stream_fields) >= JSON_STREAM_MIN_CHARS
+    ):
+        response, etag = streamed_json(content, stream_fields, headers)
+        etag = "W/" + etag
+    else:
+        response = FastJSONResponse(content, headers=headers)
+        etag = "W/" + strong_etag(response.body)
+    response.headers["ETag"] = etag
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+    return response
@@ -0,0 +1,147 @@
+import hashlib
+import uuid
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import pydantic_core
+from pydantic import BaseModel
+from starlette.responses import Response, StreamingResponse
+
+try:
+    import orjson  # optional, fastest for plain dicts and lists
+except ImportError:
+    orjson = None
+
+
+# characters of a streamed string field encoded per body chunk
+STREAM_CHUNK_CHARS = 256 * 1024
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def render_json(content: Any) -> bytes:
+    """
+    Encode content to JSON bytes with a native encoder.
+    Models are serialized by pydantic-core straight from their fields, without
+    validating them again or building an intermediate dict.
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content, default=_orjson_default)
+    return pydantic_core.to_json(content)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for already validated content. Returned from a route it
+    bypasses FastAPI's response_model validation and jsonable_encoder.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+
+def _get_path(value: Any, path: str) -> Any:
+    for part in path.split("."):
+        value = value[int(part)] if isinstance(value, (list, tuple)) else getattr(value, part)
+    return value
+
+
+def _replace_path(value: Any, parts: List[str], new: Any) -> Any:
+    if not parts:
+        return new
+    head, rest = parts[0], parts[1:]
+    if isinstance(value, (list, tuple)):
+        index = int(head)
+        items = list(value)
+        items[index] = _replace_path(items[index], rest, new)
+        return items
+    return value.model_copy(update={head: _replace_path(getattr(value, head), rest, new)})
+
+
+def field_lengths(model: BaseModel, fields: Sequence[str]) -> int:
+    """Combined length of the string fields at the dotted paths, None counts as 0."""
+    return sum(len(_get_path(model, path) or "") for path in fields)
+
+
+def _split_on_fields(model: BaseModel, fields: Sequence[str]) -> Tuple[List[bytes], List[str]]:
+    """
+    Render model with the string fields at the dotted paths cut out.
+    Returns the rendered pieces around them and the field values, in body order,
+    so pieces[0] + value 0 + pieces[1] + ... + pieces[-1] is the whole body.
+    """
+    markers = {}
+    skeleton = model
+    for path in fields:
+        if _get_path(model, path) is None:
+            continue
+        marker = f"stream-{uuid.uuid4().hex}"
+        markers[marker] = _get_path(model, path)
+        skeleton = _replace_path(skeleton, path.split("."), marker)
+    body = render_json(skeleton)
+
+    # the quotes around each value stay in the pieces
+    found = sorted((body.index(marker.encode()), marker) for marker in markers)
+    pieces, texts, position = [], [], 0
+    for start, marker in found:
+        pieces.append(body[position:start])
+        texts.append(markers[marker])
+        position = start + len(marker)
+    pieces.append(body[position:])
+    return pieces, texts
+
+
+def _encoded_chunks(text: str) -> Iterator[bytes]:
+    for start in range(0, len(text), STREAM_CHUNK_CHARS):
+        # JSON escaping is per character, so chunks concatenate to the full encoding
+        yield render_json(text[start : start + STREAM_CHUNK_CHARS])[1:-1]
+
+
+def _content_etag(pieces: List[bytes], texts: List[str]) -> str:
+    """
+    Strong tag over the rendered pieces and the raw field text. The body is a
+    deterministic encoding of exactly these, so hashing the UTF-8 text instead
+    of its JSON encoding identifies it just as well without encoding it twice.
+    """
+    digest = hashlib.sha256()
+    for piece, text in zip(pieces, texts):
+        digest.update(piece)
+        for start in range(0, len(text), STREAM_CHUNK_CHARS):
+            digest.update(text[start : start + STREAM_CHUNK_CHARS].encode("utf-8", "surrogatepass"))
+    digest.update(pieces[-1])
+    return '"' + digest.hexdigest()[:32] + '"'
+
+
+def streamed_json(
+    model: BaseModel, fields: Sequence[str], headers: Optional[dict] = None
+) -> Tuple[StreamingResponse, str]:
+    """
+    Stream a model whose string fields, given as dotted paths such as
+    "alternatives.0.subtitles", are too large to encode in one piece.
+    Only one chunk of a field is JSON encoded at a time, while the body is sent.
+    Returns the response and its strong ETag, computed from the raw field text
+    rather than the encoded body. It is stable for the same content, but differs
+    from the tag of the same body rendered in one go. Hashing is a pass over the
+    fields, call this off the event loop.
+    """
+    pieces, texts = _split_on_fields(model, fields)
+    etag = _content_etag(pieces, texts)
+
+    def body() -> Iterator[bytes]:
+        for piece, text in zip(pieces, texts):
+            yield piece
+            yield from _encoded_chunks(text)
+        yield pieces[-1]
+
+    response = StreamingResponse(
+        body(),
+        media_type="application/json",
+        headers={**(headers or {}), "ETag": etag},
+    )
+    return response, etag
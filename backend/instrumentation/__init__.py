@@ -0,0 +1,19 @@
+"""
+initalising the instrumentation module for metrics, stage timing and profiling
+"""
+
+from .metrics import render_metrics
+from .middleware import MetricsMiddleware
+from .profiling import ProfilingMiddleware, profile_store, thread_attached
+from .timing import stage, upstream_call, record_cache
+
+__all__ = [
+    "render_metrics",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "profile_store",
+    "thread_attached",
+    "stage",
+    "upstream_call",
+    "record_cache",
+]
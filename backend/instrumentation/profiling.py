@@ -0,0 +1,223 @@
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from config import (
+    PROFILE_INTERVAL_MS,
+    PROFILE_SAMPLE_RATE,
+    PROFILE_STORE_SIZE,
+    SLOW_REQUEST_MS,
+    get_logger,
+)
+from .spans import Span, current_span
+
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+_PROFILE_HEADER_VALUES = (b"1", b"true", b"yes")
+_MAX_STACK_DEPTH = 64
+_TOP_STACKS = 100
+
+
+def _fold(frame) -> str:
+    """Collapse a frame chain into a root-first 'a;b;c' stack string."""
+    names = []
+    while frame is not None and len(names) < _MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(
+            f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Statistical profiler for a single request.
+    A background thread periodically samples the stacks of the threads
+    attached to the request: the event loop thread plus any worker thread
+    currently running one of its blocking calls.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.thread_idents = set()
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="findex-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in list(self.thread_idents):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.samples[_fold(frame)] += 1
+
+    def top(self, n: int = _TOP_STACKS) -> List[Dict]:
+        return [
+            {"stack": stack, "samples": count}
+            for stack, count in self.samples.most_common(n)
+        ]
+
+
+current_sampler: ContextVar[Optional[StackSampler]] = ContextVar(
+    "current_sampler", default=None
+)
+
+
+class _ThreadAttachment:
+    __slots__ = ("_sampler", "_ident")
+
+    def __enter__(self) -> "_ThreadAttachment":
+        self._sampler = current_sampler.get()
+        if self._sampler is not None:
+            self._ident = threading.get_ident()
+            self._sampler.thread_idents.add(self._ident)
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        if self._sampler is not None:
+            self._sampler.thread_idents.discard(self._ident)
+        return False
+
+
+def thread_attached() -> _ThreadAttachment:
+    """Context manager that lets the active request profiler sample the current thread."""
+    return _ThreadAttachment()
+
+
+class ProfileStore:
+    """Bounded in-memory store of captured request profiles, oldest dropped first."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._records: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict) -> None:
+        with self._lock:
+            self._records[record["id"]] = record
+            while len(self._records) > self.size:
+                self._records.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        return self._records.get(profile_id)
+
+    def summaries(self) -> List[Dict]:
+        with self._lock:
+            records = list(self._records.values())
+        return [
+            {
+                key: record[key]
+                for key in ("id", "reason", "method", "route", "status", "duration_ms", "captured_at")
+            }
+            for record in reversed(records)
+        ]
+
+
+profile_store = ProfileStore(PROFILE_STORE_SIZE)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests on demand.
+    A request is profiled when it sends 'X-Profile: 1' or is picked by
+    PROFILE_SAMPLE_RATE, and its id is returned in 'X-Profile-Id'.
+    Every request also gets a cheap stage span tree which is kept when
+    it takes longer than SLOW_REQUEST_MS.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _profile_reason(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER and value.lower() in _PROFILE_HEADER_VALUES:
+                return "header"
+        if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._profile_reason(scope)
+        if reason is None and SLOW_REQUEST_MS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        root = Span(f'{scope["method"]} {scope["path"]}')
+        span_token = current_span.set(root)
+
+        sampler = None
+        if reason is not None:
+            sampler = StackSampler(PROFILE_INTERVAL_MS / 1000)
+            sampler.thread_idents.add(threading.get_ident())
+            sampler_token = current_sampler.set(sampler)
+            sampler.start()
+
+        status_code = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if sampler is not None:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (PROFILE_ID_HEADER, profile_id.encode())
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+
+        finally:
+            root.finish()
+            current_span.reset(span_token)
+            if sampler is not None:
+                sampler.stop()
+                current_sampler.reset(sampler_token)
+
+            duration_ms = (root.end - root.start) * 1000
+            is_slow = SLOW_REQUEST_MS > 0 and duration_ms >= SLOW_REQUEST_MS
+            if sampler is not None or is_slow:
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                profile_store.add(
+                    {
+                        "id": profile_id,
+                        "reason": reason or "slow",
+                        "method": scope["method"],
+                        "route": route,
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round(duration_ms, 3),
+                        "captured_at": time.time(),
+                        "spans": root.to_dict(),
+                        "samples": sampler.top() if sampler is not None else [],
+                    }
+                )
+                if is_slow:
+                    logger.warning(
+                        f"Slow request {scope['method']} {scope['path']} took {duration_ms:.0f}ms, profile {profile_id}"
+                    )
@@ -0,0 +1,37 @@
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, List, Optional
+
+
+class Span:
+    """A timed node in the stage tree of a single request."""
+
+    __slots__ = ("name", "start", "end", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = perf_counter()
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+
+    def child(self, name: str) -> "Span":
+        span = Span(name)
+        # list.append is atomic, children may be added from worker threads
+        self.children.append(span)
+        return span
+
+    def finish(self) -> None:
+        self.end = perf_counter()
+
+    def to_dict(self, origin: Optional[float] = None) -> Dict:
+        origin = self.start if origin is None else origin
+        end = self.end if self.end is not None else perf_counter()
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round((end - self.start) * 1000, 3),
+            "children": [child.to_dict(origin) for child in list(self.children)],
+        }
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
@@ -0,0 +1,109 @@
+from time import perf_counter
+from typing import Dict, Tuple
+
+from .metrics import CallbackGauge, Counter, Gauge, Histogram
+from .spans import current_span
+
+
+REQUEST_LATENCY = Histogram(
+    "findex_http_request_duration_seconds",
+    "Latency of HTTP requests by route template.",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "findex_http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
+STAGE_LATENCY = Histogram(
+    "findex_stage_duration_seconds",
+    "Latency of internal pipeline stages.",
+    ("stage",),
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    "findex_upstream_in_flight",
+    "Calls currently in flight to an upstream service.",
+    ("upstream",),
+)
+CACHE_REQUESTS = Counter(
+    "findex_cache_requests_total",
+    "Cache lookups by cache and result.",
+    ("cache", "result"),
+)
+
+
+def _cache_hit_ratios() -> Dict[Tuple[str, ...], float]:
+    totals: Dict[str, list] = {}
+    for (cache, result), child in list(CACHE_REQUESTS._children.items()):
+        hits_and_total = totals.setdefault(cache, [0.0, 0.0])
+        if result == "hit":
+            hits_and_total[0] += child.value
+        hits_and_total[1] += child.value
+
+    return {
+        (cache,): hits / total
+        for cache, (hits, total) in totals.items()
+        if total
+    }
+
+
+CACHE_HIT_RATIO = CallbackGauge(
+    "findex_cache_hit_ratio",
+    "Fraction of cache lookups that were hits since startup.",
+    _cache_hit_ratios,
+    ("cache",),
+)
+
+
+class _Stage:
+    __slots__ = ("_name", "_histogram", "_start", "_span", "_token")
+
+    def __init__(self, name: str):
+        self._name = name
+        self._histogram = STAGE_LATENCY.labels(name)
+        self._span = None
+
+    def __enter__(self) -> "_Stage":
+        # only build a span tree when the request is being traced
+        parent = current_span.get()
+        if parent is not None:
+            self._span = parent.child(self._name)
+            self._token = current_span.set(self._span)
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self._histogram.observe(perf_counter() - self._start)
+        if self._span is not None:
+            self._span.finish()
+            current_span.reset(self._token)
+        return False
+
+
+class _UpstreamCall:
+    __slots__ = ("_gauge",)
+
+    def __init__(self, upstream: str):
+        self._gauge = UPSTREAM_IN_FLIGHT.labels(upstream)
+
+    def __enter__(self) -> "_UpstreamCall":
+        self._gauge.inc()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self._gauge.dec()
+        return False
+
+
+def stage(name: str) -> _Stage:
+    """Context manager that records how long a pipeline stage took."""
+    return _Stage(name)
+
+
+def upstream_call(upstream: str) -> _UpstreamCall:
+    """Context manager that counts a call as in flight to the given upstream."""
+    return _UpstreamCall(upstream)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup as a hit or a miss."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
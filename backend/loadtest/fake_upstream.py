@@ -0,0 +1,298 @@
+"""
+Stand-in for YouTube and Jina AI, for load testing FindexAI without touching either.
+
+Serves yt-dlp style extract_info payloads, VTT subtitle tracks and page markdown
+with configurable latency and error rates. Recordings in --recordings are served
+when present, anything else is synthesized. Point the backend at it with
+
+    YOUTUBE_UPSTREAM_URL=http://127.0.0.1:8900 JINA_BASE_URL=http://127.0.0.1:8900/jina/ uvicorn main:app
+
+    python loadtest/fake_upstream.py --latency-ms 400 --jitter-ms 200 --error-rate 0.02
+    python loadtest/fake_upstream.py record https://www.youtube.com/watch?v=dQw4w9WgXcQ --langs en,es
+
+Video ids starting with 'notfound' answer 404, like a removed video.
+
+Recording layout:
+    <id>.info.json              extract_info payload, subtitle URLs are rewritten on serve
+    <id>.<lang>.<kind>.vtt      subtitle track, kind is manual or auto
+    <sha256 of url>.md          markdown for a page
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+DEFAULT_RECORDINGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+
+_VIDEO_ID_PATTERN = re.compile(r"(?:v=|youtu\.be/|/shorts/)([\w-]{6,})")
+_SUBTITLE_PATH = re.compile(r"^/youtube/subtitles/([\w-]+)/([\w-]+)/(manual|auto)\.vtt$")
+
+_WORDS = (
+    "the video explains how engines rockets orbit fuel cost launch data model "
+    "training results people market history design performance memory cache"
+).split()
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 503: "Service Unavailable"}
+
+# info dict fields the backend reads, anything else is dropped from recordings
+_INFO_FIELDS = (
+    "id", "title", "description", "duration", "uploader", "upload_date",
+    "view_count", "like_count", "tags", "categories",
+)
+
+
+def video_id_from_url(url: str) -> Optional[str]:
+    match = _VIDEO_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def markdown_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _timestamp(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{seconds:06.3f}"
+
+
+def synthesize_vtt(video_id: str, lang: str, kind: str, minutes: float) -> str:
+    """A deterministic transcript, auto tracks repeat the previous line like YouTube's do."""
+    rng = random.Random(f"{video_id}/{lang}/{kind}")
+    lines = ["WEBVTT", "Kind: captions", f"Language: {lang}", ""]
+    previous = ""
+    for cue in range(int(minutes * 60 / 3)):
+        start = cue * 3
+        text = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 12)))
+        lines.append(f"{_timestamp(start)} --> {_timestamp(start + 3)} align:start position:0%")
+        if kind == "auto" and previous:
+            lines.append(previous)
+        lines.append(text)
+        lines.append("")
+        previous = text
+    return "\n".join(lines)
+
+
+def synthesize_info(video_id: str, minutes: float) -> Dict:
+    rng = random.Random(video_id)
+    return {
+        "id": video_id,
+        "title": f"Load test video {video_id}",
+        "description": " ".join(rng.choice(_WORDS) for _ in range(60)),
+        "duration": int(minutes * 60),
+        "uploader": "FindexAI load test",
+        "upload_date": "20250101",
+        "view_count": rng.randint(1_000, 10_000_000),
+        "like_count": rng.randint(10, 100_000),
+        "tags": rng.sample(_WORDS, 5),
+        "categories": ["Education"],
+        "subtitles": {"en": [{"ext": "vtt"}]},
+        "automatic_captions": {lang: [{"ext": "vtt"}] for lang in ("en", "es", "de")},
+    }
+
+
+def synthesize_markdown(url: str) -> str:
+    rng = random.Random(url)
+    sections = []
+    for section in range(8):
+        body = " ".join(rng.choice(_WORDS) for _ in range(120))
+        sections.append(f"## Section {section + 1}\n\n{body}\n")
+    return f"# {url}\n\n" + "\n".join(sections)
+
+
+class FakeUpstream:
+    def __init__(self, args):
+        self.args = args
+        self.base_url = f"http://{args.host}:{args.port}"
+        self.requests: Counter = Counter()
+        self._vtt_cache: Dict[Tuple[str, str, str], bytes] = {}
+
+    def _recording(self, name: str) -> Optional[bytes]:
+        path = os.path.join(self.args.recordings, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _info(self, video_id: str) -> Dict:
+        recorded = self._recording(f"{video_id}.info.json")
+        info = json.loads(recorded) if recorded else synthesize_info(
+            video_id, self.args.transcript_minutes
+        )
+        # every track points back at this server
+        for kind, field in (("manual", "subtitles"), ("auto", "automatic_captions")):
+            info[field] = {
+                lang: [
+                    {
+                        "ext": "vtt",
+                        "url": f"{self.base_url}/youtube/subtitles/{video_id}/{lang}/{kind}.vtt",
+                    }
+                ]
+                for lang in (info.get(field) or {})
+            }
+        return info
+
+    def _vtt(self, video_id: str, lang: str, kind: str) -> bytes:
+        key = (video_id, lang, kind)
+        if key not in self._vtt_cache:
+            self._vtt_cache[key] = self._recording(f"{video_id}.{lang}.{kind}.vtt") or (
+                synthesize_vtt(video_id, lang, kind, self.args.transcript_minutes).encode()
+            )
+        return self._vtt_cache[key]
+
+    def route(self, target: str) -> Tuple[str, int, str, bytes]:
+        """Returns (route name, status, content type, body)."""
+        parsed = urlparse(target)
+
+        if parsed.path == "/youtube/extract_info":
+            url = parse_qs(parsed.query).get("url", [""])[0]
+            video_id = video_id_from_url(url)
+            if not video_id or video_id.startswith("notfound"):
+                return "extract_info", 404, "text/plain", b"Video unavailable"
+            body = json.dumps(self._info(video_id)).encode()
+            return "extract_info", 200, "application/json", body
+
+        match = _SUBTITLE_PATH.match(parsed.path)
+        if match:
+            return "subtitles", 200, "text/vtt", self._vtt(*match.groups())
+
+        if parsed.path.startswith("/jina/"):
+            url = unquote(target[len("/jina/"):])
+            body = self._recording(f"{markdown_key(url)}.md") or synthesize_markdown(url).encode()
+            return "jina", 200, "text/markdown", body
+
+        return "unknown", 404, "text/plain", b"Not found"
+
+    async def _delay(self) -> None:
+        latency = self.args.latency_ms + random.uniform(-1, 1) * self.args.jitter_ms
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = True
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.lower() == "connection" and value.strip().lower() == "close":
+                        keep_alive = False
+
+                _, target, _ = request_line.decode("latin-1").split(" ", 2)
+                name, status, content_type, body = self.route(target)
+                await self._delay()
+                if status == 200 and random.random() < self.args.error_rate:
+                    status, content_type, body = self.args.error_status, "text/plain", b"upstream error"
+                self.requests[(name, status)] += 1
+
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+                        f"Content-Type: {content_type}\r\n"
+                        f"Content-Length: {len(body)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+
+        except (ConnectionError, ValueError):
+            pass
+
+        finally:
+            writer.close()
+
+    def summary(self) -> str:
+        return "\n".join(
+            f"  {name:<14}{status:>5}{count:>10}"
+            for (name, status), count in sorted(self.requests.items())
+        )
+
+
+async def serve(args) -> None:
+    upstream = FakeUpstream(args)
+    server = await asyncio.start_server(upstream.handle, args.host, args.port, backlog=1024)
+    print(f"fake upstream on {upstream.base_url}")
+    print(f"  YOUTUBE_UPSTREAM_URL={upstream.base_url}")
+    print(f"  JINA_BASE_URL={upstream.base_url}/jina/")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        print("requests served:\n" + upstream.summary())
+
+
+def record(args) -> None:
+    """Save one real video's info and subtitle tracks as a recording."""
+    import yt_dlp
+
+    os.makedirs(args.recordings, exist_ok=True)
+    with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
+        info = ydl.extract_info(args.url, download=False, process=False)
+        video_id = info["id"]
+
+        saved = {field: info.get(field) for field in _INFO_FIELDS}
+        for kind, field in (("manual", "subtitles"), ("auto", "automatic_captions")):
+            tracks = info.get(field) or {}
+            saved[field] = {lang: [{"ext": "vtt"}] for lang in tracks if lang != "live_chat"}
+
+            for lang in args.langs.split(","):
+                vtt = [f for f in tracks.get(lang, []) if f.get("ext") == "vtt"]
+                if vtt:
+                    content = ydl.urlopen(vtt[0]["url"]).read()
+                    with open(os.path.join(args.recordings, f"{video_id}.{lang}.{kind}.vtt"), "wb") as f:
+                        f.write(content)
+                    print(f"recorded {kind} {lang} track, {len(content)} bytes")
+
+    with open(os.path.join(args.recordings, f"{video_id}.info.json"), "w", encoding="utf-8") as f:
+        json.dump(saved, f, default=str)
+    print(f"recorded {video_id} to {args.recordings}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS)
+    subparsers = parser.add_subparsers(dest="command")
+
+    recorder = subparsers.add_parser("record", help="record a real video")
+    recorder.add_argument("url")
+    recorder.add_argument("--langs", default="en")
+
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--transcript-minutes", type=float, default=20)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args)
+        return 0
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Open-loop load generator for the FindexAI API.
+
+Requests are started on a fixed schedule at the target rate no matter how fast
+the server answers, and latency is measured from the scheduled start, so a
+stalled server shows up in the tail instead of silently lowering the load.
+Reports p50/p95/p99 latency, throughput and error rates per endpoint.
+
+    python loadtest/load_generator.py --rps 20 --duration 60
+    python loadtest/load_generator.py --mix video-info=2,subs=1,ask=1 --videos 200 --json
+
+Run the backend against loadtest/fake_upstream.py so YouTube is never touched.
+Each virtual client sends its own X-API-Key (loadtest-0, loadtest-1, ...), list them
+in API_KEYS on the server or they all share one address bucket. Raise
+CLIENT_RATE_LIMIT_PER_MIN and the upstream limits to measure the server rather than
+its admission control.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+QUESTIONS = (
+    "What is this video about?",
+    "Who is the channel?",
+    "How long is the video?",
+    "What does it say about rockets?",
+    "Summarise the main points.",
+)
+
+ENDPOINTS = {
+    "video-info": "/youtube/video-info/",
+    "subs": "/youtube/subs/",
+    "ask": "/ask/",
+}
+
+
+def request_body(endpoint: str, video_url: str, client: int) -> Dict:
+    if endpoint == "ask":
+        return {
+            "url": video_url,
+            "question": random.choice(QUESTIONS),
+            "user_id": f"loadtest-{client}",
+        }
+    return {"url": video_url}
+
+
+class HTTPConnectionPool:
+    """Keep-alive HTTP/1.1 connections over plain asyncio streams."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def request(
+        self, method: str, path: str, body: bytes, headers: Dict[str, str], timeout: float
+    ) -> Tuple[int, int]:
+        """Send one request and read the whole response, returns (status, body bytes)."""
+        reader, writer = self._idle.pop() if self._idle else await asyncio.open_connection(
+            self.host, self.port
+        )
+        try:
+            status, length, keep_alive = await asyncio.wait_for(
+                self._exchange(reader, writer, method, path, body, headers), timeout
+            )
+
+        except BaseException:
+            writer.close()
+            raise
+
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, length
+
+    async def _exchange(self, reader, writer, method, path, body, headers) -> Tuple[int, int, bool]:
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        head.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip().lower()
+
+        keep_alive = response_headers.get("connection") != "close"
+        if "content-length" in response_headers:
+            length = int(response_headers["content-length"])
+            await reader.readexactly(length)
+        elif response_headers.get("transfer-encoding") == "chunked":
+            length = 0
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                length += size
+                if size == 0:
+                    break
+        else:
+            length = len(await reader.read())
+            keep_alive = False
+        return status, length, keep_alive
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.bytes = 0
+        self.dropped = 0
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def report(self, elapsed: float) -> Dict:
+        sent = sum(self.statuses.values())
+        errors = sum(count for status, count in self.statuses.items() if status == "error" or int(status) >= 400)
+        return {
+            "sent": sent,
+            "dropped": self.dropped,
+            "throughput_rps": round((sent - errors) / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(errors / sent, 4) if sent else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 1),
+            "p95_ms": round(self.percentile(0.95) * 1000, 1),
+            "p99_ms": round(self.percentile(0.99) * 1000, 1),
+            "max_ms": round(max(self.latencies, default=0) * 1000, 1),
+            "response_bytes": self.bytes,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+        }
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"unknown endpoint {name!r}, choose from {', '.join(ENDPOINTS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def run(args) -> Tuple[Dict[str, EndpointStats], float]:
+    parsed = urlparse(args.base_url)
+    pool = HTTPConnectionPool(parsed.hostname, parsed.port or 80)
+    weights = parse_mix(args.mix)
+    video_urls = [
+        f"https://www.youtube.com/watch?v=loadtest{index:03d}" for index in range(args.videos)
+    ]
+    stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+    in_flight = 0
+    tasks = set()
+
+    headers = {"Content-Type": "application/json"}
+    if args.gzip:
+        headers["Accept-Encoding"] = "gzip"
+
+    async def one(endpoint: str, scheduled: float) -> None:
+        nonlocal in_flight
+        client = random.randrange(args.clients)
+        body = json.dumps(request_body(endpoint, random.choice(video_urls), client)).encode()
+        try:
+            status, length = await pool.request(
+                "POST",
+                ENDPOINTS[endpoint],
+                body,
+                {**headers, "X-API-Key": f"loadtest-{client}"},
+                args.timeout,
+            )
+            stats[endpoint].statuses[status] += 1
+            stats[endpoint].bytes += length
+
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            stats[endpoint].statuses["error"] += 1
+
+        finally:
+            stats[endpoint].latencies.append(time.perf_counter() - scheduled)
+            in_flight -= 1
+
+    names, endpoint_weights = list(weights), list(weights.values())
+    started = time.perf_counter()
+    total = int(args.rps * args.duration)
+    for index in range(total):
+        scheduled = started + index / args.rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        endpoint = random.choices(names, endpoint_weights)[0]
+        if in_flight >= args.max_in_flight:
+            stats[endpoint].dropped += 1
+            continue
+        in_flight += 1
+        task = asyncio.create_task(one(endpoint, scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - started
+
+
+def print_report(reports: Dict[str, Dict], elapsed: float) -> None:
+    print(f"ran for {elapsed:.1f}s")
+    print(
+        f"{'endpoint':<12}{'sent':>7}{'drop':>6}{'ok rps':>8}{'err %':>7}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  statuses"
+    )
+    for endpoint, report in reports.items():
+        statuses = " ".join(f"{status}={count}" for status, count in report["statuses"].items())
+        print(
+            f"{endpoint:<12}{report['sent']:>7}{report['dropped']:>6}"
+            f"{report['throughput_rps']:>8.1f}{report['error_rate'] * 100:>6.1f}%"
+            f"{report['p50_ms']:>7.0f}ms{report['p95_ms']:>7.0f}ms"
+            f"{report['p99_ms']:>7.0f}ms{report['max_ms']:>7.0f}ms  {statuses}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--mix", default="video-info=1,subs=1,ask=1")
+    parser.add_argument("--videos", type=int, default=50, help="distinct videos to spread load over")
+    parser.add_argument("--clients", type=int, default=50, help="distinct X-API-Key values")
+    parser.add_argument("--max-in-flight", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--gzip", action="store_true", help="send Accept-Encoding: gzip")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    stats, elapsed = asyncio.run(run(args))
+    reports = {endpoint: stats[endpoint].report(elapsed) for endpoint in sorted(stats)}
+
+    if args.json:
+        print(json.dumps({"elapsed_s": round(elapsed, 2), "endpoints": reports}, indent=2))
+    else:
+        print_report(reports, elapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
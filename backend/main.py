@@ -1,48 +1,13 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-import routes as r
-
 from config import BACKEND_HOST, BACKEND_PORT
 from config import get_logger
+from services import create_app
 
 
 logger = get_logger(__name__)
 
 
-app = FastAPI(
-    title="FindexAI API - Ctrl + F on Steroids",
-    description="Chat with YouTube videos or any webpage, ask questions, and get answers based on video content.",
-    version="1.0.0",
-)   
-
-
-# CORS configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-# register routes
-app.include_router(
-    r.youtube.info, 
-    prefix="/youtube/video-info", 
-    tags=["YouTube Video Info"],
-)
-app.include_router(
-    r.youtube.subs, 
-    prefix="/youtube/subs", 
-    tags=["YouTube Subtitles"],
-)
-app.include_router(
-    r.ask, 
-    prefix="/ask", 
-    tags=["Ask Questions"],
-)
+# every route group in one process, see services/ for per-service entry points
+app = create_app()
 
 
 # server start
@@ -55,4 +20,4 @@ if __name__ == "__main__":
         port=BACKEND_PORT,
         reload=True,
         log_level="info",
-    )
\ No newline at end of file
+    )
@@ -14,3 +14,6 @@ class YTVideoInfo(BaseModel):
     categories: List[str] = Field(default_factory=list)
     captions: Optional[str] = None
     transcript: Optional[str] = None
+    transcript_total_length: int = Field(default=0)
+    transcript_next_offset: Optional[int] = None
+    stale: bool = Field(default=False)
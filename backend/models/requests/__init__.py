@@ -2,10 +2,16 @@
 initalizing the requests pydantic models
 """
 
+from .transcript import TranscriptPageRequest
 from .video_info import VideoInfoRequest
 from .subs import SubsRequest
+from .ask import AskRequest
+from .prefetch import PrefetchRequest
 
 __all__ = [
+    "TranscriptPageRequest",
     "VideoInfoRequest",
     "SubsRequest",
+    "AskRequest",
+    "PrefetchRequest",
 ]
@@ -0,0 +1,11 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class AskRequest(BaseModel):
+    url: str
+    question: str
+    # without a user_id every question starts a new conversation unless conversation_id is sent
+    user_id: Optional[str] = Field(default=None, min_length=1)
+    conversation_id: Optional[str] = None
+    new_conversation: bool = Field(default=False)
@@ -1,6 +1,15 @@
-from pydantic import BaseModel, Field
+from typing import List, Optional
+from pydantic import Field
+from .transcript import TranscriptPageRequest
 
 
-class SubsRequest(BaseModel):
+class SubsRequest(TranscriptPageRequest):
     url: str
     lang: str = Field(default="en")
+    # ordered preferences, takes over from lang when given
+    langs: Optional[List[str]] = Field(default=None, min_length=1)
+    max_tracks: int = Field(default=1, ge=1, le=5)
+
+    @property
+    def preferred_langs(self) -> List[str]:
+        return self.langs or [self.lang]
@@ -0,0 +1,14 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class TranscriptPageRequest(BaseModel):
+    """
+    Selects part of a transcript: a time range in seconds picks the cues,
+    offset and limit are character positions in the cleaned text of that range.
+    """
+
+    offset: int = Field(default=0, ge=0)
+    limit: Optional[int] = Field(default=None, ge=1)
+    start_time: Optional[float] = Field(default=None, ge=0)
+    end_time: Optional[float] = Field(default=None, gt=0)
@@ -1,5 +1,7 @@
-from pydantic import BaseModel
+from pydantic import Field
+from .transcript import TranscriptPageRequest
 
 
-class VideoInfoRequest(BaseModel):
+class VideoInfoRequest(TranscriptPageRequest):
     url: str
+    include_transcript: bool = Field(default=True)
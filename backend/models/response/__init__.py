@@ -2,8 +2,9 @@
 initalizing the requests pydantic models
 """
 
-from .subs import SubsResponse
+from .subs import SubsResponse, SubtitleTrack
 
 __all__ = [
     "SubsResponse",
+    "SubtitleTrack",
 ]
@@ -1,7 +1,24 @@
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
+class SubtitleTrack(BaseModel):
+    lang: str
+    kind: str
+    subtitles: str = Field(default="")
+    total_length: int = Field(default=0)
+    next_offset: Optional[int] = None
+
+
 class SubsResponse(BaseModel):
     subtitles: str = Field(default="")
     error: str = Field(default="")
     success: bool = Field(default=False)
+    stale: bool = Field(default=False)
+    offset: int = Field(default=0)
+    total_length: int = Field(default=0)
+    next_offset: Optional[int] = None
+    lang: str = Field(default="")
+    kind: str = Field(default="")
+    # further tracks when more than one was requested, paged like the first
+    alternatives: List[SubtitleTrack] = Field(default_factory=list)
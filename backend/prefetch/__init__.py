@@ -0,0 +1,13 @@
+"""
+initalising the prefetch module, low priority background warm-up of caches and indexes
+"""
+
+from .queue import PrefetchQueue, prefetch_queue
+from .youtube import prefetch_video, warm_video
+
+__all__ = [
+    "PrefetchQueue",
+    "prefetch_queue",
+    "prefetch_video",
+    "warm_video",
+]
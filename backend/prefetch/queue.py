@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Hashable
+
+from config import PREFETCH_DEDUP_SECONDS, PREFETCH_MAX_PENDING, get_logger
+from instrumentation.metrics import CallbackGauge, Counter
+from workers import submit_background
+
+
+logger = get_logger(__name__)
+
+PREFETCH_JOBS = Counter(
+    "findex_prefetch_jobs_total",
+    "Prefetch requests by outcome.",
+    ("result",),
+)
+
+
+class PrefetchQueue:
+    """
+    Deduplicated, bounded set of background warm-up jobs.
+    A key is not queued again while it is pending or for `dedup_seconds`
+    after it ran. Jobs run at background priority on the shared worker pool.
+    """
+
+    def __init__(self, max_pending: int, dedup_seconds: float, max_remembered: int = 4096):
+        self.max_pending = max_pending
+        self.dedup_seconds = dedup_seconds
+        self.max_remembered = max_remembered
+        self._pending = set()
+        self._finished: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, key: Hashable, job: Callable[[], None]) -> str:
+        """Queue job under key, returns 'queued', 'duplicate' or 'full'."""
+        with self._lock:
+            finished_at = self._finished.get(key)
+            if key in self._pending or (
+                finished_at is not None and monotonic() - finished_at < self.dedup_seconds
+            ):
+                result = "duplicate"
+            elif len(self._pending) >= self.max_pending:
+                result = "full"
+            else:
+                self._pending.add(key)
+                result = "queued"
+
+        PREFETCH_JOBS.labels(result).inc()
+        if result == "queued":
+            submit_background(self._run, key, job)
+        return result
+
+    def _run(self, key: Hashable, job: Callable[[], None]) -> None:
+        try:
+            job()
+            PREFETCH_JOBS.labels("done").inc()
+
+        except Exception as e:
+            PREFETCH_JOBS.labels("failed").inc()
+            logger.warning(f"Prefetch of {key} failed: {e}")
+
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+                self._finished[key] = monotonic()
+                self._finished.move_to_end(key)
+                while len(self._finished) > self.max_remembered:
+                    self._finished.popitem(last=False)
+
+
+prefetch_queue = PrefetchQueue(PREFETCH_MAX_PENDING, PREFETCH_DEDUP_SECONDS)
+
+PREFETCH_PENDING = CallbackGauge(
+    "findex_prefetch_pending",
+    "Prefetch jobs queued or running.",
+    lambda: {(): prefetch_queue.pending},
+)
@@ -0,0 +1,40 @@
+from admission import AdmissionRejected, background_upstream
+from config import get_logger
+from youtube_utils import extract_video_id, fetch_video_info, index_transcript
+from .queue import prefetch_queue
+
+
+logger = get_logger(__name__)
+
+
+def warm_video(video_url: str, video_id: str) -> None:
+    """
+    Fill the video info, transcript and cleaned transcript caches for a video
+    and build its retrieval index, so a later /ask finds everything warm.
+    Every real upstream call spends a youtube token, cached parts cost nothing.
+    The warm-up stops once only PREFETCH_UPSTREAM_RESERVE tokens are left,
+    those are kept for interactive requests.
+    """
+    try:
+        with background_upstream():
+            video_info = fetch_video_info(video_url, include_transcript=True)
+
+    except AdmissionRejected:
+        logger.info(f"Skipping prefetch of {video_id}, youtube budget is reserved for requests")
+        return
+
+    if video_info.transcript:
+        index_transcript(video_id, video_info.transcript)
+
+
+def prefetch_video(video_url: str) -> str:
+    """
+    Queue a background warm-up for the video, deduplicated by video id.
+    Returns 'queued', 'duplicate' or 'full'. Raises ValueError for a non YouTube URL.
+    """
+    video_id = extract_video_id(video_url)
+    if not video_id:
+        raise ValueError(f"Not a YouTube video URL: {video_url}")
+    return prefetch_queue.enqueue(
+        ("youtube", video_id), lambda: warm_video(video_url, video_id)
+    )
@@ -0,0 +1,17 @@
+"""
+initalising the resilience module: retries, circuit breakers and stale fallbacks for upstreams
+"""
+
+from .breaker import UpstreamUnavailable, get_breaker, upstream_unavailable_handler
+from .retry import call_upstream
+from .stale_cache import StaleCache, fetch_fresh, fetch_with_fallback
+
+__all__ = [
+    "UpstreamUnavailable",
+    "get_breaker",
+    "upstream_unavailable_handler",
+    "call_upstream",
+    "StaleCache",
+    "fetch_fresh",
+    "fetch_with_fallback",
+]
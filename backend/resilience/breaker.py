@@ -0,0 +1,138 @@
+import math
+import threading
+from time import monotonic
+from typing import Dict, Tuple
+
+from starlette.responses import JSONResponse
+
+from config import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS, get_logger
+from instrumentation.metrics import CallbackGauge, Counter
+
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class UpstreamUnavailable(Exception):
+    """Raised when an upstream's circuit is open and no cached value can be served."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"{upstream} is temporarily unavailable, try again later")
+        self.upstream = upstream
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+BREAKER_TRANSITIONS = Counter(
+    "findex_circuit_transitions_total",
+    "Circuit breaker state changes by upstream and new state.",
+    ("upstream", "state"),
+)
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker.
+    Opens after `failure_threshold` consecutive failures, rejects calls for
+    `reset_timeout` seconds, then lets a single trial call through (half open)
+    which closes it again on success.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            BREAKER_TRANSITIONS.labels(self.name, state).inc()
+            logger.warning(f"Circuit for {self.name} is now {state}")
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return (
+                self.state == OPEN
+                and monotonic() - self._opened_at < self.reset_timeout
+            )
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Whether a call may go to the upstream now."""
+        with self._lock:
+            if self.state == OPEN and monotonic() - self._opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+                self._trial_in_flight = False
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = monotonic()
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """End a call that says nothing about upstream health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(upstream)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                upstream, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS
+            )
+            _breakers[upstream] = breaker
+        return breaker
+
+
+def _breaker_states() -> Dict[Tuple[str, ...], float]:
+    return {(name,): _STATE_VALUES[b.state] for name, b in list(_breakers.items())}
+
+
+BREAKER_STATE = CallbackGauge(
+    "findex_circuit_state",
+    "Circuit breaker state per upstream (0 closed, 1 half open, 2 open).",
+    _breaker_states,
+    ("upstream",),
+)
+
+
+async def upstream_unavailable_handler(request, exc: UpstreamUnavailable) -> JSONResponse:
+    """FastAPI exception handler turning an open circuit into a 503."""
+    return JSONResponse(
+        {"detail": str(exc)},
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
@@ -0,0 +1,50 @@
+import random
+import time
+from typing import Callable, Tuple, Type, TypeVar
+
+from config import RETRY_ATTEMPTS, RETRY_BASE_DELAY_SECONDS, RETRY_MAX_DELAY_SECONDS
+from .breaker import UpstreamUnavailable, get_breaker
+
+
+T = TypeVar("T")
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full jitter exponential backoff: uniform in [0, min(max, base * 2^attempt)]."""
+    return random.uniform(
+        0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2**attempt)
+    )
+
+
+def call_upstream(
+    upstream: str,
+    fetcher: Callable[[], T],
+    ignore: Tuple[Type[BaseException], ...] = (),
+) -> T:
+    """
+    Call an upstream through its circuit breaker, retrying failures with jittered backoff.
+    Exceptions in `ignore` (e.g. not found) are raised at once and do not count as failures.
+    """
+    breaker = get_breaker(upstream)
+    for attempt in range(RETRY_ATTEMPTS):
+        if not breaker.allow():
+            raise UpstreamUnavailable(upstream, breaker.retry_after())
+
+        try:
+            value = fetcher()
+
+        except ignore:
+            breaker.release()
+            raise
+
+        except Exception:
+            breaker.record_failure()
+            if attempt + 1 >= RETRY_ATTEMPTS:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        breaker.record_success()
+        return value
+
+    raise UpstreamUnavailable(upstream, breaker.retry_after())
@@ -0,0 +1,179 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from typing import Callable, Dict, Hashable, Optional, Tuple, Type, TypeVar
+
+from config import STALE_CACHE_MAX_ENTRIES, get_logger
+from instrumentation import record_cache
+from instrumentation.metrics import Counter
+from .breaker import get_breaker
+from .retry import call_upstream
+
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+STALE_SERVED = Counter(
+    "findex_stale_served_total",
+    "Cached values served past their freshness window.",
+    ("cache", "reason"),
+)
+
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="findex-refresh")
+
+
+class StaleCache:
+    """
+    Last known good values for an upstream, bounded by entry count.
+    Values are fresh for `fresh_seconds` and kept afterwards so they can be
+    served stale while the upstream is down or being revalidated.
+    """
+
+    def __init__(self, name: str, fresh_seconds: float, max_entries: int = STALE_CACHE_MAX_ENTRIES):
+        self.name = name
+        self.fresh_seconds = fresh_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[object, float]]" = OrderedDict()
+        self._refreshing = set()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[object, bool]]:
+        """Return (value, is_fresh) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        value, stored_at = entry
+        return value, monotonic() - stored_at < self.fresh_seconds
+
+    def put(self, key: Hashable, value: object) -> None:
+        with self._lock:
+            self._entries[key] = (value, monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def single_flight(self, key: Hashable, fetch: Callable[[], T]) -> T:
+        """
+        Run fetch for key unless a call for the same key is already in flight,
+        in which case wait for it and share its result or exception.
+        Callers for other keys are never held up.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = fetch()
+
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+
+        else:
+            future.set_result(value)
+            return value
+
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def start_refresh(self, key: Hashable) -> bool:
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def finish_refresh(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+
+def fetch_fresh(
+    upstream: str,
+    cache: StaleCache,
+    key: Hashable,
+    fetcher: Callable[[], T],
+    ignore: Tuple[Type[BaseException], ...] = (),
+) -> T:
+    """
+    Return a fresh value, calling the upstream unless the cached one is still fresh.
+    For values a stale copy is no good for. Shares the call with a concurrent
+    miss or background refresh of the same key, raises like call_upstream.
+    """
+
+    def fill() -> T:
+        # another flight may have refreshed it just before this one started
+        entry = cache.get(key)
+        if entry is not None and entry[1]:
+            return entry[0]
+
+        value = call_upstream(upstream, fetcher, ignore)
+        cache.put(key, value)
+        return value
+
+    return cache.single_flight(key, fill)
+
+
+def _refresh(upstream: str, cache: StaleCache, key: Hashable, fetcher, ignore) -> None:
+    try:
+        fetch_fresh(upstream, cache, key, fetcher, ignore)
+
+    except Exception as e:
+        logger.warning(f"Background refresh of {cache.name} {key} failed: {e}")
+
+    finally:
+        cache.finish_refresh(key)
+
+
+def fetch_with_fallback(
+    upstream: str,
+    cache: StaleCache,
+    key: Hashable,
+    fetcher: Callable[[], T],
+    ignore: Tuple[Type[BaseException], ...] = (),
+) -> Tuple[T, bool]:
+    """
+    Stale-while-revalidate fetch. Returns (value, is_stale).
+    Fresh entries are returned directly. A stale entry is returned at once while
+    the circuit is open or a background refresh runs. Only a miss waits on the
+    upstream, which raises UpstreamUnavailable when its circuit is open.
+    Concurrent misses for the same key share one upstream call.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry[1]:
+        record_cache(cache.name, True)
+        return entry[0], False
+    record_cache(cache.name, False)
+
+    if entry is not None:
+        if get_breaker(upstream).is_open:
+            STALE_SERVED.labels(cache.name, "circuit_open").inc()
+        else:
+            if cache.start_refresh(key):
+                _refresh_pool.submit(_refresh, upstream, cache, key, fetcher, ignore)
+            STALE_SERVED.labels(cache.name, "revalidating").inc()
+        return entry[0], True
+
+    def fill() -> Tuple[T, bool]:
+        # another flight may have filled it just before this one started
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0], not entry[1]
+
+        value = call_upstream(upstream, fetcher, ignore)
+        cache.put(key, value)
+        return value, False
+
+    return cache.single_flight(key, fill)
@@ -1,13 +1,25 @@
 """
 intialising routes as a module
+routers are imported on first access so each service only loads its own routes.
 """
 
-from .asker import router as ask
-from .health import router as health
-from . import youtube
+from config import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "admin": (".admin", "router"),
+        "ask": (".asker", "router"),
+        "health": (".health", "router"),
+        "metrics": (".metrics", "router"),
+        "youtube": (".youtube", None),
+    },
+)
 
 __all__ = [
+    "admin",
     "ask",
     "health",
+    "metrics",
     "youtube",
 ]
@@ -0,0 +1,51 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from config import ADMIN_TOKEN, DEV_ENV
+from instrumentation import profile_store
+
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Admin endpoints need the 'X-Admin-Token' header to match ADMIN_TOKEN.
+    Without a configured token they are only open in development.
+    """
+    if ADMIN_TOKEN:
+        if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid admin token",
+            )
+    elif DEV_ENV != "development":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled, set ADMIN_TOKEN to enable them",
+        )
+
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """
+    Lists captured request profiles, newest first.
+    """
+    return {
+        "profiles": profile_store.summaries(),
+    }
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str):
+    """
+    Returns the span tree and sampled stacks of a captured request.
+    """
+    record = profile_store.get(profile_id)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    return record
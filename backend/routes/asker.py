@@ -1,15 +1,47 @@
-from fastapi import APIRouter, HTTPException, Request
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException
+from chat_history import load_context, record_turn
 from config import get_logger
 from models import YTVideoInfo
-from youtube_utils import get_video_info, extract_video_id
+from models.requests import AskRequest
+from youtube_utils import (
+    get_video_info,
+    extract_video_id,
+    relevant_passages,
+    YouTubeNotFound,
+    YouTubeRestricted,
+)
+from instrumentation import stage
+from admission import AdmissionRejected
+from resilience import UpstreamUnavailable
+from workers import run_blocking
 
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
-async def generate_answer(video_info: YTVideoInfo, question: str) -> str:
-    """Generate answer using video information"""
+def format_history(history: Optional[Dict]) -> str:
+    """Render the summary and recent turns of a conversation for the prompt."""
+    if not history or not (history["summary"] or history["messages"]):
+        return "None"
+
+    lines = []
+    if history["summary"]:
+        lines.append(f"    Earlier (summary):\n{history['summary']}")
+    lines.extend(
+        f"    {message['role']}: {message['content']}" for message in history["messages"]
+    )
+    return "\n" + "\n".join(lines)
+
+
+async def generate_answer(
+    video_info: YTVideoInfo,
+    question: str,
+    history: Optional[Dict] = None,
+    passages: Optional[List[str]] = None,
+) -> str:
+    """Generate answer using video information and the conversation so far"""
 
     desc_for_context = (
         video_info.description if video_info.description else "No description available"
@@ -27,6 +59,8 @@ async def generate_answer(video_info: YTVideoInfo, question: str) -> str:
         f"  Tags: {tags_for_context}\n"
         f"  Categories: {categories_for_context}\n"
         f"  Transcript: {video_info.transcript[:200] if video_info.transcript else 'Not available'}...\n"
+        f"  Relevant transcript: {' ... '.join(passage[:200] for passage in passages) if passages else 'None'}\n"
+        f"  Conversation: {format_history(history)}\n"
     )
 
     question_lower = question.lower()
@@ -57,15 +91,10 @@ async def generate_answer(video_info: YTVideoInfo, question: str) -> str:
 
 # route
 @router.post("/", response_model=dict)
-async def ask(request: Request):
+async def ask(request: AskRequest):
     try:
-        data = request.get_json()
-
-        if not data:
-            return ({"error": "No data provided"}), 400
-
-        url = data.get("url")
-        question = data.get("question")
+        url = request.url
+        question = request.question
 
         if not url or not question:
             raise HTTPException(
@@ -77,11 +106,11 @@ async def ask(request: Request):
 
         video_id = extract_video_id(url)
         if not video_id:
-            return ({"error": "Invalid YouTube URL"}), 400
+            raise HTTPException(status_code=400, detail="Invalid YouTube URL")
 
         # info using yt-dlp
-        video_info_obj = get_video_info(
-            url
+        video_info_obj = await run_blocking(
+            get_video_info, url
         )  # Renamed to avoid confusion, this is a YTVideoInfo object
         if not video_info_obj:
             raise HTTPException(
@@ -89,15 +118,43 @@ async def ask(request: Request):
                 detail=f"Could not fetch video information",
             )
 
+        # conversation so far, bounded by the context token budget
+        conversation_id, history = await load_context(
+            request.user_id,
+            f"youtube:{video_id}",
+            request.conversation_id,
+            request.new_conversation,
+        )
+
+        # transcript chunks relevant to the question, the index is already built if prefetched
+        passages = []
+        if video_info_obj.transcript:
+            passages = await run_blocking(
+                relevant_passages, video_id, video_info_obj.transcript, question
+            )
+
         # answer
-        answer = generate_answer(video_info_obj, question)
+        with stage("generation"):
+            answer = await generate_answer(video_info_obj, question, history, passages)
+
+        await record_turn(request.user_id, conversation_id, question, answer)
 
         return {
             "answer": answer,
+            "conversation_id": conversation_id,
             "video_title": video_info_obj.title,  # Direct attribute access
             "video_channel": video_info_obj.uploader,  # Direct attribute access
         }
 
+    except YouTubeRestricted as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    except YouTubeNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    except (HTTPException, UpstreamUnavailable, AdmissionRejected):
+        raise
+
     except Exception as e:
         logger.error(f"Error processing request: {e}")
         raise HTTPException(
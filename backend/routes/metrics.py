@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from instrumentation import render_metrics
+
+
+router = APIRouter()
+
+
+@router.get("", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus scrape endpoint with request, stage, cache and worker pool metrics.
+    """
+    return PlainTextResponse(
+        render_metrics(),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -2,10 +2,19 @@
 initalised youtube routes
 """
 
-from .video_info import router as info
-from .video_subs import router as subs
+from config import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "info": (".video_info", "router"),
+        "subs": (".video_subs", "router"),
+        "prefetch": (".prefetch", "router"),
+    },
+)
 
 __all__ = [
     "info",
     "subs",
+    "prefetch",
 ]
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException, status
+from config import get_logger
+from models.requests import PrefetchRequest
+from prefetch import prefetch_video
+
+
+router = APIRouter()
+logger = get_logger(__name__)
+
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+async def prefetch_handler(request: PrefetchRequest):
+    """
+    Fire and forget warm-up, called by the extension when a video page opens.
+    Video info, transcript and retrieval index are built in the background at
+    low priority, a video already queued or recently warmed is not queued again.
+    """
+    try:
+        result = prefetch_video(request.url)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"Prefetch for {request.url}: {result}")
+    return {
+        "status": result,
+    }
@@ -1,27 +1,92 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, status
 from models import YTVideoInfo
 from models.requests import VideoInfoRequest
 from config import get_logger
-from youtube_utils import get_video_info
+from http_utils import conditional_json
+from admission import AdmissionRejected
+from resilience import UpstreamUnavailable
+from youtube_utils import (
+    extract_video_id,
+    fetch_subtitles,
+    get_video_info,
+    transcript_page,
+    YouTubeNotFound,
+    YouTubeRestricted,
+)
+from workers import run_blocking
 
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
+async def with_transcript_page(
+    video_info: YTVideoInfo, request: VideoInfoRequest
+) -> YTVideoInfo:
+    """Attach the requested page of the English transcript, if there is one."""
+    try:
+        raw_transcript, stale = await run_blocking(fetch_subtitles, request.url, "en")
+        transcript, total_length, next_offset = await run_blocking(
+            transcript_page,
+            raw_transcript,
+            request.offset,
+            request.limit,
+            request.start_time,
+            request.end_time,
+        )
+
+    except AdmissionRejected:
+        raise
+
+    except Exception as e:
+        logger.info(f"No transcript available or error fetching for {request.url}: {e}")
+        return video_info
+
+    return video_info.model_copy(
+        update={
+            "transcript": transcript,
+            "transcript_total_length": total_length,
+            "transcript_next_offset": next_offset,
+            "stale": video_info.stale or stale,
+        }
+    )
+
+
 @router.post("/", response_model=YTVideoInfo)
-async def video_info_handler(request: VideoInfoRequest):
+async def video_info_handler(
+    request: VideoInfoRequest, if_none_match: Optional[str] = Header(default=None)
+):
     url = request.url
     logger.info(f"Received /video-info request for URL: {url}")
 
+    if not extract_video_id(url):
+        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
+
     try:
-        video_info_obj = get_video_info(url)
+        # metadata only, the transcript is fetched and paged below when asked for
+        video_info_obj = await run_blocking(get_video_info, url, False)
         if not video_info_obj:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Could not fetch video information",
             )
-        return video_info_obj
+
+        if request.include_transcript:
+            video_info_obj = await with_transcript_page(video_info_obj, request)
+
+        return await run_blocking(
+            conditional_json, video_info_obj, if_none_match, stream_fields=("transcript",)
+        )
+
+    except YouTubeRestricted as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    except YouTubeNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    except (HTTPException, UpstreamUnavailable, AdmissionRejected):
+        raise
 
     except Exception as e:
         logger.error(f"Error in /video-info route: {e}")
@@ -1,71 +1,115 @@
-from fastapi import APIRouter, HTTPException
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Header, HTTPException
 from config import get_logger
+from http_utils import conditional_json
 from models.requests import SubsRequest
-from models.response import SubsResponse
-from youtube_utils import get_subtitle_content, processed_transcript
+from models.response import SubsResponse, SubtitleTrack
+from admission import AdmissionRejected
+from resilience import UpstreamUnavailable
+from youtube_utils import (
+    extract_video_id,
+    fetch_subtitle_tracks,
+    transcript_page,
+    YouTubeNotFound,
+    YouTubeRestricted,
+)
+from workers import run_blocking
 
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
+def page_tracks(tracks: List[Dict], request: SubsRequest) -> List[SubtitleTrack]:
+    """Clean every fetched track and cut the requested page out of each."""
+    paged = []
+    for track in tracks:
+        subtitles, total_length, next_offset = transcript_page(
+            track["content"],
+            request.offset,
+            request.limit,
+            request.start_time,
+            request.end_time,
+        )
+        paged.append(
+            SubtitleTrack(
+                lang=track["lang"],
+                kind=track["kind"],
+                subtitles=subtitles,
+                total_length=total_length,
+                next_offset=next_offset,
+            )
+        )
+    return paged
+
+
 @router.post("/", response_model=SubsResponse)
-async def get_subtitles_handler(request: SubsRequest):
+async def get_subtitles_handler(
+    request: SubsRequest, if_none_match: Optional[str] = Header(default=None)
+):
     url = request.url
-    lang = request.lang
+    langs = request.preferred_langs
 
     if not url:
         raise HTTPException(status_code=400, detail="URL is required")
+    if not extract_video_id(url):
+        raise HTTPException(status_code=400, detail="Invalid YouTube URL")
+
+    logger.info(f"Received /subs request for URL: {url}, langs: {', '.join(langs)}")
+
+    try:
+        tracks, stale = await run_blocking(
+            fetch_subtitle_tracks, url, langs, request.max_tracks
+        )
+
+    except YouTubeRestricted as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    except YouTubeNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-    logger.info(f"Received /subs request for URL: {url}, lang: {lang}")
+    except (UpstreamUnavailable, AdmissionRejected):
+        # served as a 503 or 429 with Retry-After by the app's exception handlers
+        raise
 
-    subtitle_text_raw = get_subtitle_content(url, lang)
+    except Exception as e:
+        logger.error(f"Error downloading subtitles for {url}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error downloading subtitles: {str(e)}",
+        )
 
-    if not subtitle_text_raw:
+    if not tracks[0]["content"]:
         raise HTTPException(
             status_code=404,
             detail="Failed to retrieve subtitles or subtitles are empty.",
         )
 
-    known_error_messages = [
-        "Video unavailable.",
-        "Subtitles not available for the specified language.",
-        "Subtitles were requested but could not be retrieved from file.",
-        "Subtitles not available for the specified language or download failed.",
-    ]
-    known_error_prefixes = [
-        "Error downloading subtitles:",
-        "An unexpected error occurred while fetching subtitles:",
-    ]
-
-    is_actual_error = False
-    if subtitle_text_raw in known_error_messages:
-        is_actual_error = True
-    else:
-        for prefix in known_error_prefixes:
-            if subtitle_text_raw.startswith(prefix):
-                is_actual_error = True
-                break
-
-    if is_actual_error:
-        status_code = 500
-        if (
-            "unavailable" in subtitle_text_raw.lower()
-            or "not found" in subtitle_text_raw.lower()
-            or "not available" in subtitle_text_raw.lower()
-        ):
-            status_code = 404
-        raise HTTPException(status_code=status_code, detail=subtitle_text_raw)
-
-    cleaned_subtitle_text = processed_transcript(subtitle_text_raw)
-
-    if not cleaned_subtitle_text:
+    served, *alternatives = await run_blocking(page_tracks, tracks, request)
+
+    ranged = request.start_time is not None or request.end_time is not None
+    if not served.total_length and not ranged:
         raise HTTPException(
             status_code=404,
             detail="Subtitles became empty after cleaning. Original may have only contained timestamps/metadata.",
         )
 
-    return {
-        "success": True,
-        "subtitles": cleaned_subtitle_text,
-    }
+    return await run_blocking(
+        conditional_json,
+        SubsResponse(
+            success=True,
+            subtitles=served.subtitles,
+            stale=stale,
+            offset=request.offset,
+            total_length=served.total_length,
+            next_offset=served.next_offset,
+            lang=served.lang,
+            kind=served.kind,
+            alternatives=alternatives,
+        ),
+        if_none_match,
+        stream_fields=(
+            "subtitles",
+            *(f"alternatives.{index}.subtitles" for index in range(len(alternatives))),
+        ),
+    )
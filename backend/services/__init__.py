@@ -0,0 +1,12 @@
+"""
+initalising per-service entry points
+each module builds an app with only its own route group, run one with
+uvicorn services.<name>:app
+"""
+
+from .factory import create_app, ROUTE_GROUPS
+
+__all__ = [
+    "create_app",
+    "ROUTE_GROUPS",
+]
@@ -0,0 +1,85 @@
+from typing import Iterable, Optional
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+import routes as r
+from admission import AdmissionMiddleware, AdmissionRejected, admission_rejected_handler
+from http_utils import CompressionMiddleware
+from instrumentation import MetricsMiddleware, ProfilingMiddleware
+from resilience import UpstreamUnavailable, upstream_unavailable_handler
+
+
+# route group -> (router path in the routes package, prefix, tag)
+ROUTE_GROUPS = {
+    "youtube": (
+        ("youtube.info", "/youtube/video-info", "YouTube Video Info"),
+        ("youtube.subs", "/youtube/subs", "YouTube Subtitles"),
+        ("youtube.prefetch", "/youtube/prefetch", "YouTube Prefetch"),
+    ),
+    "ask": (
+        ("ask", "/ask", "Ask Questions"),
+    ),
+    "admin": (
+        ("admin", "/admin", "Admin"),
+    ),
+}
+
+# mounted on every service so each one can be probed and scraped
+BASE_ROUTES = (
+    ("health", "/health", "Health"),
+    ("metrics", "/metrics", "Metrics"),
+)
+
+
+def _resolve_router(path: str):
+    router = r
+    for part in path.split("."):
+        router = getattr(router, part)
+    return router
+
+
+def create_app(groups: Optional[Iterable[str]] = None) -> FastAPI:
+    """
+    Build the API with only the given route groups mounted, all of them by default.
+    Route modules are imported here, so a service only pays for what it serves.
+    """
+    groups = list(ROUTE_GROUPS) if groups is None else list(groups)
+    unknown = [group for group in groups if group not in ROUTE_GROUPS]
+    if unknown:
+        raise ValueError(f"Unknown route groups: {', '.join(unknown)}")
+
+    app = FastAPI(
+        title="FindexAI API - Ctrl + F on Steroids",
+        description="Chat with YouTube videos or any webpage, ask questions, and get answers based on video content.",
+        version="1.0.0",
+    )
+
+    # shed load inside CORS so rejections still carry CORS headers
+    app.add_middleware(AdmissionMiddleware)
+    app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
+    app.add_exception_handler(UpstreamUnavailable, upstream_unavailable_handler)
+
+    # CORS configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # compress inside profiling and metrics so encoding time is measured
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
+    # register routes
+    routes = [route for group in groups for route in ROUTE_GROUPS[group]]
+    for path, prefix, tag in routes + list(BASE_ROUTES):
+        app.include_router(
+            _resolve_router(path),
+            prefix=prefix,
+            tags=[tag],
+        )
+
+    return app
@@ -0,0 +1,5 @@
+from .factory import create_app
+
+
+# health and metrics only, the lightest possible service
+app = create_app([])
@@ -0,0 +1,4 @@
+from .factory import create_app
+
+
+app = create_app(["youtube"])
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from chat_history import ConversationNotFound, ConversationStore
+
+
+TARGET = "youtube:abc123"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ConversationStore(str(tmp_path / "chat.db"))
+
+
+def test_foreign_conversation_id_starts_a_new_conversation(store):
+    alice = store.get_or_create("alice", TARGET)
+    store.add_message(alice, "alice", "user", "my secret question")
+
+    bob = store.get_or_create("bob", TARGET, alice)
+
+    assert bob != alice
+    assert store.context_window(bob, "bob")["messages"] == []
+
+
+def test_context_window_and_add_message_are_scoped_by_user(store):
+    alice = store.get_or_create("alice", TARGET)
+
+    with pytest.raises(ConversationNotFound):
+        store.context_window(alice, "bob")
+    with pytest.raises(ConversationNotFound):
+        store.add_message(alice, "bob", "user", "hello")
+
+
+def test_client_chosen_conversation_id_is_not_used(store):
+    conversation_id = store.get_or_create("alice", TARGET, "chosen-by-client")
+    assert conversation_id != "chosen-by-client"
+
+
+def test_oversized_message_does_not_empty_the_window(store):
+    conversation_id = store.get_or_create("alice", TARGET)
+    store.add_message(conversation_id, "alice", "user", "What is the video about?")
+    store.add_message(conversation_id, "alice", "assistant", "It is about rockets.")
+    store.add_message(conversation_id, "alice", "user", "Tell me everything.")
+    store.add_message(conversation_id, "alice", "assistant", "word " * 5000)
+
+    window = store.context_window(conversation_id, "alice", budget=400)
+
+    assert [message["role"] for message in window["messages"]] == [
+        "user",
+        "assistant",
+        "user",
+        "assistant",
+    ]
+    assert window["messages"][0]["content"] == "What is the video about?"
+    assert window["messages"][-1]["content"].endswith("…")
+    assert window["tokens"] <= 400
+
+
+def test_concurrent_compactions_fold_each_turn_once(tmp_path):
+    calls = []
+
+    def slow_summary(previous, messages):
+        calls.append(len(messages))
+        time.sleep(0.1)
+        return (previous + "\n" if previous else "") + f"{len(messages)} turns"
+
+    store = ConversationStore(str(tmp_path / "chat.db"), summarizer=slow_summary)
+    conversation_id = store.get_or_create("alice", TARGET)
+    for turn in range(20):
+        store.add_message(conversation_id, "alice", "user", f"question {turn} " + "x" * 400)
+
+    threads = [
+        threading.Thread(target=store.compact, args=(conversation_id, 500, 200))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert store.context_window(conversation_id, "alice")["summary"] == f"{calls[0]} turns"
@@ -0,0 +1,50 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from http_utils import CompressionMiddleware, FastJSONResponse
+
+
+PAYLOAD = {"transcript": "the video explains how rockets reach orbit " * 2000}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/buffered")
+    async def buffered():
+        return FastJSONResponse(PAYLOAD)
+
+    @app.get("/streamed")
+    async def streamed():
+        body = json.dumps(PAYLOAD).encode()
+        chunks = (body[start : start + 4096] for start in range(0, len(body), 4096))
+        return StreamingResponse(chunks, media_type="application/json")
+
+    return TestClient(app)
+
+
+def _raw_body(response) -> bytes:
+    # httpx decodes known encodings itself, read the bytes as sent instead
+    return b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize("path", ["/buffered", "/streamed"])
+def test_brotli_path(client, path):
+    brotli = pytest.importorskip("brotli")
+    with client.stream("GET", path, headers={"Accept-Encoding": "br"}) as response:
+        assert response.headers["content-encoding"] == "br"
+        assert json.loads(brotli.decompress(_raw_body(response))) == PAYLOAD
+
+
+@pytest.mark.parametrize("path", ["/buffered", "/streamed"])
+def test_gzip_path(client, path):
+    with client.stream("GET", path, headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert json.loads(gzip.decompress(_raw_body(response))) == PAYLOAD
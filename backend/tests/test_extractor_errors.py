@@ -0,0 +1,43 @@
+import pytest
+import yt_dlp
+
+from resilience import get_breaker
+from youtube_utils import YouTubeNotFound, YouTubeRestricted, extract_video_id, get_subs
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("ERROR: [youtube] abc: Private video. Sign in if you've been granted access", YouTubeRestricted),
+        ("ERROR: [youtube] abc: Sign in to confirm your age", YouTubeRestricted),
+        ("ERROR: [generic] Unsupported URL: https://example.com", YouTubeNotFound),
+        ("ERROR: [youtube] abc: Video unavailable", YouTubeNotFound),
+    ],
+)
+def test_permanent_extractor_errors_do_not_trip_the_breaker(monkeypatch, message, expected):
+    calls = []
+
+    def extract_info(video_url, ydl_opts, process=True):
+        calls.append(video_url)
+        raise yt_dlp.utils.DownloadError(message)
+
+    monkeypatch.setattr(get_subs, "extract_info", extract_info)
+    breaker = get_breaker("youtube")
+
+    for attempt in range(10):
+        with pytest.raises(expected):
+            get_subs.fetch_subtitle_tracks(
+                f"https://www.youtube.com/watch?v=permanent{attempt}", ["en"]
+            )
+
+    # one extraction per call, no retries, and the circuit stays closed
+    assert len(calls) == 10
+    assert not breaker.is_open
+
+
+def test_non_youtube_urls_have_no_video_id():
+    assert extract_video_id("not a url 1") is None
+    assert extract_video_id("https://example.com/watch?v=abc") is None
+    assert extract_video_id("https://www.youtube.com/watch") is None
+    assert extract_video_id("https://youtu.be/dQw4w9WgXcQ?t=3") == "dQw4w9WgXcQ"
+    assert extract_video_id("https://m.youtube.com/shorts/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
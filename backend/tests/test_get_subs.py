@@ -0,0 +1,92 @@
+from resilience import stale_cache
+from youtube_utils import get_subs
+
+
+VIDEO_URL = "https://www.youtube.com/watch?v=refresh0001"
+VIDEO_ID = "refresh0001"
+
+
+class DeferredPool:
+    """Holds background refreshes until run() so they start after the caller returns."""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append((fn, args))
+
+    def run(self):
+        for fn, args in self.calls:
+            fn(*args)
+
+
+def test_stale_refresh_keeps_each_track_under_its_own_key(monkeypatch):
+    listing = {
+        ("en", get_subs.MANUAL): {"ext": "vtt", "url": "en"},
+        ("es", get_subs.MANUAL): {"ext": "vtt", "url": "es"},
+    }
+    monkeypatch.setattr(get_subs, "_list_tracks", lambda video_url: listing)
+    monkeypatch.setattr(
+        get_subs, "_download_track", lambda subtitle_format: subtitle_format["url"].upper()
+    )
+
+    tracks, stale = get_subs.fetch_subtitle_tracks(VIDEO_URL, ["en", "es"], max_tracks=2)
+    assert [track["content"] for track in tracks] == ["EN", "ES"]
+    assert not stale
+
+    # every track is now stale, the next call serves them and queues refreshes
+    pool = DeferredPool()
+    monkeypatch.setattr(stale_cache, "_refresh_pool", pool)
+    monkeypatch.setattr(get_subs._subtitle_cache, "fresh_seconds", 0)
+    _, stale = get_subs.fetch_subtitle_tracks(VIDEO_URL, ["en", "es"], max_tracks=2)
+    assert stale
+    assert len(pool.calls) == 2
+    pool.run()
+
+    assert get_subs._subtitle_cache.get((VIDEO_ID, "en", get_subs.MANUAL))[0] == "EN"
+    assert get_subs._subtitle_cache.get((VIDEO_ID, "es", get_subs.MANUAL))[0] == "ES"
+
+
+def test_stale_listing_is_refetched_before_downloading(monkeypatch):
+    video_url = "https://www.youtube.com/watch?v=expired0001"
+    urls = {"current": "old"}
+    downloaded = []
+
+    def list_tracks(video_url):
+        return {
+            ("en", get_subs.MANUAL): {"ext": "vtt", "url": urls["current"] + "-en"},
+            ("es", get_subs.MANUAL): {"ext": "vtt", "url": urls["current"] + "-es"},
+        }
+
+    def download_track(subtitle_format):
+        downloaded.append(subtitle_format["url"])
+        return subtitle_format["url"]
+
+    monkeypatch.setattr(get_subs, "_list_tracks", list_tracks)
+    monkeypatch.setattr(get_subs, "_download_track", download_track)
+    get_subs.fetch_subtitle_tracks(video_url, ["en"])
+
+    # the listing and its URLs have expired, and "es" has never been downloaded
+    urls["current"] = "new"
+    pool = DeferredPool()
+    monkeypatch.setattr(stale_cache, "_refresh_pool", pool)
+    monkeypatch.setattr(get_subs._track_listing_cache, "fresh_seconds", 0)
+    monkeypatch.setattr(get_subs._subtitle_cache, "fresh_seconds", 0)
+    tracks, _ = get_subs.fetch_subtitle_tracks(video_url, ["en", "es"], max_tracks=2)
+    assert tracks[1]["content"] == "new-es"
+
+    # the refresh of the stale "en" track was bound to the new listing too
+    pool.run()
+    assert downloaded == ["old-en", "new-es", "new-en"]
+
+
+def test_choose_tracks_counts_repeated_languages_once():
+    listing = {
+        ("en", get_subs.MANUAL): {},
+        ("en", get_subs.AUTO): {},
+        ("es", get_subs.MANUAL): {},
+    }
+    assert get_subs.choose_tracks(listing, ["en", " en", "es"], max_tracks=2) == [
+        ("en", get_subs.MANUAL),
+        ("es", get_subs.MANUAL),
+    ]
@@ -0,0 +1,25 @@
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from http_utils import json_response, render_json
+
+
+class Track(BaseModel):
+    lang: str
+    content: str
+
+
+CONTENT = {"tracks": [Track(lang="en", content="héllo")], "count": 1, "stale": False}
+EXPECTED = {"tracks": [{"lang": "en", "content": "héllo"}], "count": 1, "stale": False}
+
+
+def test_orjson_path():
+    pytest.importorskip("orjson")
+    assert json.loads(render_json(CONTENT)) == EXPECTED
+
+
+def test_fallback_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_response, "orjson", None)
+    assert json.loads(render_json(CONTENT)) == EXPECTED
@@ -0,0 +1,48 @@
+import pytest
+
+from admission import AdmissionRejected, acquire_upstream, background_upstream, limiter
+from admission.token_bucket import TokenBucket
+from prefetch import youtube as prefetch_youtube
+
+
+@pytest.fixture
+def youtube_bucket(monkeypatch):
+    # a nearly frozen bucket so nothing refills during the test
+    bucket = TokenBucket(rate=1e-6, capacity=5)
+    monkeypatch.setitem(limiter._upstreams, "youtube", bucket)
+    return bucket
+
+
+def test_background_acquire_leaves_the_reserve(youtube_bucket):
+    with background_upstream(reserve=2):
+        for _ in range(3):
+            acquire_upstream("youtube")
+        with pytest.raises(AdmissionRejected):
+            acquire_upstream("youtube")
+
+    # the reserve is still there for interactive requests
+    acquire_upstream("youtube")
+    acquire_upstream("youtube")
+    with pytest.raises(AdmissionRejected):
+        acquire_upstream("youtube")
+
+
+def test_prefetch_cannot_starve_interactive_requests(monkeypatch, youtube_bucket):
+    warmed = []
+
+    def fetch_video_info(video_url, include_transcript):
+        # a cold video costs several upstream calls, more than the whole bucket
+        for _ in range(10):
+            acquire_upstream("youtube")
+        warmed.append(video_url)
+
+    monkeypatch.setattr(prefetch_youtube, "fetch_video_info", fetch_video_info)
+    monkeypatch.setattr(prefetch_youtube, "background_upstream", lambda: background_upstream(2))
+
+    for video in range(3):
+        prefetch_youtube.warm_video(f"https://youtu.be/video{video}", f"video{video}")
+
+    assert warmed == []
+    assert youtube_bucket.tokens == pytest.approx(2, abs=0.01)
+    acquire_upstream("youtube")
+    acquire_upstream("youtube")
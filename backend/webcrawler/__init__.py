@@ -1,11 +1,21 @@
 """
 initalising a web scapper which returns markdown text
+submodules are imported on first use to keep startup light.
 """
 
-from .html_md import return_html_md as html_md_convertor
-from .request_md import return_markdown as markdown_fetcher
+from config import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "html_md_convertor": (".html_md", "return_html_md"),
+        "markdown_fetcher": (".request_md", "return_markdown"),
+        "fetch_markdown": (".request_md", "fetch_markdown"),
+    },
+)
 
 __all__ = [
     "html_md_convertor",
-    "html_md_convertor",
+    "markdown_fetcher",
+    "fetch_markdown",
 ]
@@ -1,16 +1,21 @@
-from bs4 import BeautifulSoup
-import html2text
+from instrumentation import stage
 
 
 def return_html_md(html: str) -> str:
     """Extension sends html body its converted to markdown text."""
-    soup = BeautifulSoup(html, "html.parser")
-    markdowntext = html2text.html2text(soup.body.prettify())
+    # deferred, only the crawler routes need these
+    from bs4 import BeautifulSoup
+    import html2text
+
+    with stage("html_to_markdown"):
+        soup = BeautifulSoup(html, "html.parser")
+        markdowntext = html2text.html2text(soup.body.prettify())
     return markdowntext
 
 
 if __name__ == "__main__":
     import requests
+    from bs4 import BeautifulSoup
 
     url = "https://portfolio.tashif.codes"
 
@@ -1,9 +1,43 @@
-import requests
+from typing import Tuple
 
+from admission import AdmissionRejected, acquire_upstream
+from config import JINA_BASE_URL, MARKDOWN_FRESH_SECONDS, UPSTREAM_TIMEOUT_SECONDS
+from instrumentation import stage, upstream_call
+from resilience import StaleCache, fetch_with_fallback
 
-def return_markdown(url: str) -> str:
-    """Fetches the markdown content from a given URL using the Jina AI service."""
-    res = requests.get("https://r.jina.ai/" + url)
+
+_markdown_cache = StaleCache("markdown", MARKDOWN_FRESH_SECONDS)
+
+
+def _request_markdown(url: str) -> str:
+    import requests  # deferred to keep startup light
+
+    acquire_upstream("jina")
+    with upstream_call("jina"), stage("jina_fetch"):
+        res = requests.get(JINA_BASE_URL + url, timeout=UPSTREAM_TIMEOUT_SECONDS)
+    # rate limiting and server errors are upstream failures, retry them
+    if res.status_code == 429 or res.status_code >= 500:
+        res.raise_for_status()
     # soup = BeautifulSoup(res.content, "html.parser")
     # return soup.prettify()
     return res.text
+
+
+def fetch_markdown(url: str) -> Tuple[str, bool]:
+    """
+    Markdown for a URL via Jina AI with retries, a circuit breaker and the
+    last known good copy as fallback. Returns (markdown, is_stale).
+    """
+    return fetch_with_fallback(
+        "jina",
+        _markdown_cache,
+        url,
+        lambda: _request_markdown(url),
+        ignore=(AdmissionRejected,),
+    )
+
+
+def return_markdown(url: str) -> str:
+    """Fetches the markdown content from a given URL using the Jina AI service."""
+    markdown, _ = fetch_markdown(url)
+    return markdown
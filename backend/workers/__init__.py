@@ -0,0 +1,12 @@
+"""
+initalising the workers module which runs blocking calls off the event loop
+"""
+
+from .executor import background_depth, queue_depth, run_blocking, submit_background
+
+__all__ = [
+    "run_blocking",
+    "submit_background",
+    "queue_depth",
+    "background_depth",
+]
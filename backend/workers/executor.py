@@ -0,0 +1,163 @@
+import asyncio
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import Future
+from time import perf_counter
+from typing import Callable, TypeVar
+
+from config import EXECUTOR_MAX_WORKERS, PREFETCH_MAX_WORKERS
+from instrumentation.metrics import CallbackGauge, Histogram
+from instrumentation.profiling import thread_attached
+
+
+T = TypeVar("T")
+
+INTERACTIVE = 0
+BACKGROUND = 1
+_PRIORITY_NAMES = ("interactive", "background")
+
+EXECUTOR_QUEUE_WAIT = Histogram(
+    "findex_executor_queue_wait_seconds",
+    "Time blocking calls spent queued before a worker picked them up.",
+    ("priority",),
+)
+
+
+class PriorityPool:
+    """
+    Fixed size worker pool with an interactive and a background queue.
+    Idle workers always take interactive calls first. Background calls only run
+    when no interactive call is waiting, and at most `background_limit` at once,
+    so background work can never occupy the whole pool.
+    Threads are started on demand, like ThreadPoolExecutor.
+    """
+
+    def __init__(self, max_workers: int, background_limit: int):
+        self.max_workers = max_workers
+        self.background_limit = max(1, min(background_limit, max_workers))
+        self._queues = (deque(), deque())
+        self._active = [0, 0]
+        self._idle = 0
+        self._threads = []
+        self._condition = threading.Condition()
+
+    def queued(self, priority: int) -> int:
+        return len(self._queues[priority])
+
+    def active(self, priority: int) -> int:
+        return self._active[priority]
+
+    def submit(self, priority: int, fn: Callable[[], T]) -> Future:
+        future = Future()
+        with self._condition:
+            self._queues[priority].append((future, fn, perf_counter()))
+            self._wake_or_spawn()
+        return future
+
+    def _wake_or_spawn(self) -> None:
+        # called with the condition held, every notify reserves one idle worker
+        if self._idle > 0:
+            self._idle -= 1
+            self._condition.notify()
+        elif len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._work,
+                name=f"findex-worker_{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _next(self):
+        if self._queues[INTERACTIVE]:
+            return INTERACTIVE, self._queues[INTERACTIVE].popleft()
+        if self._queues[BACKGROUND] and self._active[BACKGROUND] < self.background_limit:
+            return BACKGROUND, self._queues[BACKGROUND].popleft()
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                item = self._next()
+                while item is None:
+                    self._idle += 1
+                    self._condition.wait()
+                    item = self._next()
+                priority, (future, fn, submitted) = item
+                self._active[priority] += 1
+
+            try:
+                # False when the caller was cancelled while the call was queued
+                if future.set_running_or_notify_cancel():
+                    EXECUTOR_QUEUE_WAIT.labels(_PRIORITY_NAMES[priority]).observe(
+                        perf_counter() - submitted
+                    )
+                    try:
+                        future.set_result(fn())
+                    except BaseException as e:
+                        future.set_exception(e)
+
+            finally:
+                with self._condition:
+                    self._active[priority] -= 1
+                    # a background call may have been held back by the limit,
+                    # hand it to an idle worker in case this one picks interactive work
+                    if priority == BACKGROUND and self._queues[BACKGROUND] and self._idle > 0:
+                        self._idle -= 1
+                        self._condition.notify()
+
+
+_pool = PriorityPool(EXECUTOR_MAX_WORKERS, PREFETCH_MAX_WORKERS)
+
+
+def queue_depth() -> int:
+    """Number of interactive calls still waiting for a worker thread."""
+    return _pool.queued(INTERACTIVE)
+
+
+def background_depth() -> int:
+    """Number of background calls still waiting for a worker thread."""
+    return _pool.queued(BACKGROUND)
+
+
+def _executor_state():
+    state = {}
+    for priority, name in enumerate(_PRIORITY_NAMES):
+        state[("queued", name)] = _pool.queued(priority)
+        state[("active", name)] = _pool.active(priority)
+    return state
+
+
+EXECUTOR_TASKS = CallbackGauge(
+    "findex_executor_tasks",
+    "Blocking calls waiting for or running on the worker pool.",
+    _executor_state,
+    ("state", "priority"),
+)
+
+
+def _run_attached(fn: Callable[..., T], *args, **kwargs) -> T:
+    with thread_attached():
+        return fn(*args, **kwargs)
+
+
+async def run_blocking(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a blocking function on the shared worker pool without stalling the event loop.
+    The caller's context variables are carried over to the worker thread.
+    Calls made for a request always run ahead of queued background work.
+    """
+    context = contextvars.copy_context()
+    future = _pool.submit(
+        INTERACTIVE, lambda: context.run(_run_attached, fn, *args, **kwargs)
+    )
+    return await asyncio.wrap_future(future)
+
+
+def submit_background(fn: Callable[..., T], *args, **kwargs) -> Future:
+    """
+    Queue a blocking function as low priority background work and return its future.
+    It runs in a fresh context, detached from the request that queued it.
+    """
+    return _pool.submit(BACKGROUND, lambda: fn(*args, **kwargs))
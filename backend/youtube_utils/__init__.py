@@ -1,18 +1,41 @@
 """
 initalization file for the youtube_agent module.
+submodules are imported on first use so yt-dlp is not loaded at startup.
 """
 
-from .extract_id import extract_video_id
-from .get_subs import get_subtitle_content
-from .get_info import get_video_info
+from config import lazy_getattr
 
-from .transcript_generator import processed_transcript
-from . import transcript_generator
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "extract_video_id": (".extract_id", "extract_video_id"),
+        "get_subtitle_content": (".get_subs", "get_subtitle_content"),
+        "fetch_subtitles": (".get_subs", "fetch_subtitles"),
+        "fetch_subtitle_tracks": (".get_subs", "fetch_subtitle_tracks"),
+        "get_video_info": (".get_info", "get_video_info"),
+        "fetch_video_info": (".get_info", "fetch_video_info"),
+        "index_transcript": (".transcript_index", "index_transcript"),
+        "relevant_passages": (".transcript_index", "relevant_passages"),
+        "YouTubeNotFound": (".errors", "YouTubeNotFound"),
+        "YouTubeRestricted": (".errors", "YouTubeRestricted"),
+        "processed_transcript": (".transcript_generator", "processed_transcript"),
+        "transcript_page": (".transcript_generator", "transcript_page"),
+        "transcript_generator": (".transcript_generator", None),
+    },
+)
 
 __all__ = [
     "extract_video_id",
     "get_subtitle_content",
+    "fetch_subtitles",
+    "fetch_subtitle_tracks",
     "get_video_info",
+    "fetch_video_info",
+    "index_transcript",
+    "relevant_passages",
+    "YouTubeNotFound",
+    "YouTubeRestricted",
     "processed_transcript",
+    "transcript_page",
     "transcript_generator",
 ]
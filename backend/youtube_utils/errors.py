@@ -0,0 +1,44 @@
+from typing import Optional
+
+
+class YouTubeNotFound(Exception):
+    """The video or the requested subtitle track does not exist. Not an upstream failure."""
+
+
+class YouTubeRestricted(YouTubeNotFound):
+    """The video exists but cannot be read, e.g. private or age restricted. Not an upstream failure."""
+
+
+# yt-dlp DownloadError messages that are about the video or the URL, not the upstream
+_NOT_FOUND_MARKERS = (
+    "video unavailable",
+    "this video is not available",
+    "has been removed",
+    "account associated with this video has been terminated",
+    "does not exist",
+    "unsupported url",
+    "is not a valid url",
+    "incomplete youtube id",
+)
+_RESTRICTED_MARKERS = (
+    "private video",
+    "sign in to confirm your age",
+    "age-restricted",
+    "age restricted",
+    "members-only",
+    "join this channel",
+    "copyright",
+)
+
+
+def permanent_download_error(error: Exception) -> Optional[YouTubeNotFound]:
+    """
+    The exception to raise instead of a yt-dlp DownloadError that retrying cannot fix,
+    or None when it is an upstream failure. These must not count against the circuit breaker.
+    """
+    message = str(error).lower()
+    if any(marker in message for marker in _RESTRICTED_MARKERS):
+        return YouTubeRestricted("Video is private or restricted.")
+    if any(marker in message for marker in _NOT_FOUND_MARKERS):
+        return YouTubeNotFound("Video unavailable.")
+    return None
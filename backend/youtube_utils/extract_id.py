@@ -1,3 +1,4 @@
+import re
 from typing import Optional
 from urllib.parse import urlparse, parse_qs
 from config import get_logger
@@ -5,16 +6,27 @@ from config import get_logger
 
 logger = get_logger(__name__)
 
+_YOUTUBE_HOSTS = ("www.youtube.com", "youtube.com", "m.youtube.com", "music.youtube.com")
+_ID_PATH_PREFIXES = ("/shorts/", "/embed/", "/live/")
+_VIDEO_ID = re.compile(r"^[\w-]+$")
+
+
+def _valid(video_id: Optional[str]) -> Optional[str]:
+    return video_id if video_id and _VIDEO_ID.match(video_id) else None
+
 
 def extract_video_id(url: str) -> Optional[str]:
-    """Extract YouTube video ID from URL"""
+    """Extract YouTube video ID from URL, None when it is not a YouTube video URL"""
     try:
         parsed_url = urlparse(url)
-        if parsed_url.hostname in ["www.youtube.com", "youtube.com"]:
+        if parsed_url.hostname in _YOUTUBE_HOSTS:
+            for prefix in _ID_PATH_PREFIXES:
+                if parsed_url.path.startswith(prefix):
+                    return _valid(parsed_url.path[len(prefix):].split("/")[0])
             query_params = parse_qs(parsed_url.query)
-            return query_params.get("v", [None])[0]
+            return _valid(query_params.get("v", [None])[0])
         elif parsed_url.hostname == "youtu.be":
-            return parsed_url.path[1:]
+            return _valid(parsed_url.path[1:].split("/")[0])
 
     except Exception as e:
         logger.error(f"Error extracting video ID: {e}")
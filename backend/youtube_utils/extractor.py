@@ -0,0 +1,39 @@
+from typing import Dict
+
+from admission import acquire_upstream
+from config import UPSTREAM_TIMEOUT_SECONDS, YOUTUBE_UPSTREAM_URL
+
+
+def _stand_in_extract(video_url: str) -> Dict:
+    import requests  # deferred to keep startup light
+    import yt_dlp
+
+    res = requests.get(
+        YOUTUBE_UPSTREAM_URL.rstrip("/") + "/youtube/extract_info",
+        params={"url": video_url},
+        timeout=UPSTREAM_TIMEOUT_SECONDS,
+    )
+    # surface failures the way yt-dlp does, so callers take the same paths
+    if res.status_code == 404:
+        raise yt_dlp.utils.DownloadError("ERROR: [youtube] Video unavailable")
+    if res.status_code != 200:
+        raise yt_dlp.utils.DownloadError(f"ERROR: [youtube] HTTP Error {res.status_code}")
+    return res.json()
+
+
+def extract_info(video_url: str, ydl_opts: Dict, process: bool = True) -> Dict:
+    """
+    yt-dlp extract_info without downloading anything.
+    When YOUTUBE_UPSTREAM_URL is set the info dict comes from that stand-in
+    upstream instead (see loadtest/fake_upstream.py), its subtitle URLs point
+    back at it, so nothing reaches YouTube.
+    Spends a youtube upstream token, or raises AdmissionRejected.
+    """
+    acquire_upstream("youtube")
+    if YOUTUBE_UPSTREAM_URL:
+        return _stand_in_extract(video_url)
+
+    import yt_dlp  # deferred, yt-dlp is slow to import
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        return ydl.extract_info(video_url, download=False, process=process)
@@ -1,79 +1,111 @@
-from . import get_subtitle_content
+from .get_subs import fetch_subtitles, remember_tracks
+from admission import AdmissionRejected
 from models import YTVideoInfo
-from config import get_logger
-from .transcript_generator import processed_transcript
-import yt_dlp
-from urllib.parse import urlparse, parse_qs
-import os
+from config import UPSTREAM_TIMEOUT_SECONDS, VIDEO_INFO_FRESH_SECONDS, get_logger
+from instrumentation import stage, upstream_call
+from resilience import StaleCache, UpstreamUnavailable, fetch_with_fallback
+from .errors import YouTubeNotFound, permanent_download_error
+from .extract_id import extract_video_id
+from .extractor import extract_info
+from .transcript_generator import cleaned_transcripts
 from typing import Optional
 
 
 logger = get_logger(__name__)
 
+_video_info_cache = StaleCache("video_info", VIDEO_INFO_FRESH_SECONDS)
+
+
+def _extract_video_info(video_url: str) -> YTVideoInfo:
+    """Get video metadata using yt-dlp, raising on upstream failures."""
+    import yt_dlp  # deferred, yt-dlp is slow to import
+
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extractaudio": False,
+        # Subtitle fetching is handled by fetch_subtitles,
+        # but we might need basic info if subtitles are requested directly here.
+        # "writesubtitles": True, # Keep this if you want ydl to attempt download for info dict
+        # "writeautomaticsub": True,
+        # "subtitleslangs": ["en"],
+        "skip_download": True,
+        "socket_timeout": UPSTREAM_TIMEOUT_SECONDS,
+    }
 
-def get_video_info(video_url: str) -> Optional[YTVideoInfo]:
-    """Get video information using yt-dlp"""
     try:
-        ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extractaudio": False,
-            # Subtitle fetching is handled by get_subtitle_content,
-            # but we might need basic info if subtitles are requested directly here.
-            # "writesubtitles": True, # Keep this if you want ydl to attempt download for info dict
-            # "writeautomaticsub": True,
-            # "subtitleslangs": ["en"],
-            "skip_download": True,
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(video_url, download=False)
-
-            video_data = {
-                "title": info.get("title", "Unknown"),
-                "description": info.get("description", ""),
-                "duration": info.get("duration", 0),
-                "uploader": info.get("uploader", "Unknown"),
-                "upload_date": info.get("upload_date", ""),
-                "view_count": info.get("view_count", 0),
-                "like_count": info.get("like_count", 0),
-                "tags": info.get("tags", []),
-                "categories": info.get("categories", []),
-                "transcript": None,
-            }
-
-            raw_transcript = get_subtitle_content(video_url, lang="en")
-
-            known_error_messages = [
-                "Video unavailable.",
-                "Subtitles not available for the specified language.",
-                "Subtitles were requested but could not be retrieved from file.",
-                "Subtitles not available for the specified language or download failed.",
-            ]
-            known_error_prefixes = [
-                "Error downloading subtitles:",
-                "An unexpected error occurred while fetching subtitles:",
-            ]
-
-            is_actual_error = False
-            if raw_transcript in known_error_messages:
-                is_actual_error = True
-            else:
-                if raw_transcript:  # Ensure raw_transcript is not None
-                    for prefix in known_error_prefixes:
-                        if raw_transcript.startswith(prefix):
-                            is_actual_error = True
-                            break
-
-            if raw_transcript and not is_actual_error:
-                cleaned_transcript = processed_transcript(raw_transcript)
-                video_data["transcript"] = cleaned_transcript
-            else:
-                logger.info(
-                    f"No transcript available or error fetching for {video_url}: {raw_transcript}"
-                )
-
-            return YTVideoInfo(**video_data)
+        with upstream_call("youtube"), stage("ytdlp_extract"):
+            info = extract_info(video_url, ydl_opts)
+
+    except yt_dlp.utils.DownloadError as e:
+        permanent = permanent_download_error(e)
+        if permanent is not None:
+            raise permanent from e
+        raise
+
+    # the same extraction lists the subtitle tracks, spare fetch_subtitles another one
+    remember_tracks(video_url, info)
+
+    video_data = {
+        "title": info.get("title", "Unknown"),
+        "description": info.get("description", ""),
+        "duration": info.get("duration", 0),
+        "uploader": info.get("uploader", "Unknown"),
+        "upload_date": info.get("upload_date", ""),
+        "view_count": info.get("view_count", 0),
+        "like_count": info.get("like_count", 0),
+        "tags": info.get("tags", []),
+        "categories": info.get("categories", []),
+        "transcript": None,
+    }
+
+    return YTVideoInfo(**video_data)
+
+
+def fetch_video_info(video_url: str, include_transcript: bool = True) -> YTVideoInfo:
+    """
+    Video information with retries, a circuit breaker and the last known good
+    copy as fallback. The returned model has stale=True when served from it.
+    Metadata and transcript are cached separately, so include_transcript=False
+    never downloads subtitles.
+    Raises YouTubeNotFound, UpstreamUnavailable, AdmissionRejected or the upstream error.
+    """
+    video_info, stale = fetch_with_fallback(
+        "youtube",
+        _video_info_cache,
+        extract_video_id(video_url) or video_url,
+        lambda: _extract_video_info(video_url),
+        ignore=(YouTubeNotFound, AdmissionRejected),
+    )
+
+    update = {"stale": stale}
+    if include_transcript:
+        try:
+            raw_transcript, transcript_stale = fetch_subtitles(video_url, lang="en")
+            update["transcript"] = cleaned_transcripts.get(raw_transcript)
+            update["stale"] = stale or transcript_stale
+
+        except AdmissionRejected:
+            raise
+
+        except Exception as e:
+            logger.info(
+                f"No transcript available or error fetching for {video_url}: {e}"
+            )
+
+    return video_info.model_copy(update=update)
+
+
+def get_video_info(video_url: str, include_transcript: bool = True) -> Optional[YTVideoInfo]:
+    """
+    Get video information using yt-dlp. Returns None on unexpected errors,
+    raises YouTubeNotFound for a video that does not exist or cannot be read.
+    """
+    try:
+        return fetch_video_info(video_url, include_transcript)
+
+    except (YouTubeNotFound, UpstreamUnavailable, AdmissionRejected):
+        raise
 
     except Exception as e:
         logger.error(f"Error getting video info: {e}")
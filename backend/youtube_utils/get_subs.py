@@ -1,97 +1,243 @@
-import os
-import yt_dlp
-from config import get_logger
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+from admission import AdmissionRejected, acquire_upstream
+from config import (
+    TRANSCRIPT_FRESH_SECONDS,
+    UPSTREAM_TIMEOUT_SECONDS,
+    VIDEO_INFO_FRESH_SECONDS,
+    get_logger,
+)
+from instrumentation import stage, upstream_call
+from resilience import (
+    StaleCache,
+    UpstreamUnavailable,
+    fetch_fresh,
+    fetch_with_fallback,
+    get_breaker,
+)
+from .errors import YouTubeNotFound, permanent_download_error
+from .extract_id import extract_video_id
+from .extractor import extract_info
 
 
 logger = get_logger(__name__)
 
-
-def get_subtitle_content(video_url: str, lang: str = "en") -> str:
-    """Downloads and extracts subtitle content for a given video URL and language."""
-
-    temp_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp_subs")
-    os.makedirs(temp_dir, exist_ok=True)
+MANUAL = "manual"
+AUTO = "auto"
+
+# subtitle formats in order of preference, the cleaners understand both
+_FORMAT_PREFERENCE = ("vtt", "srt")
+
+# video id -> {(lang, kind): format}, the download URLs in it expire after a few hours
+_track_listing_cache = StaleCache("subtitle_tracks", VIDEO_INFO_FRESH_SECONDS)
+# (video id, lang, kind) -> subtitle file content
+_subtitle_cache = StaleCache("transcript", TRANSCRIPT_FRESH_SECONDS)
+
+
+def _best_format(formats: List[Dict]) -> Optional[Dict]:
+    for ext in _FORMAT_PREFERENCE:
+        for subtitle_format in formats:
+            if subtitle_format.get("ext") == ext:
+                return subtitle_format
+    return formats[0] if formats else None
+
+
+def track_listing(info: Dict) -> Dict[Tuple[str, str], Dict]:
+    """Map (lang, kind) to the preferred format of every subtitle track in a yt-dlp info dict."""
+    listing = {}
+    for kind, field in ((MANUAL, "subtitles"), (AUTO, "automatic_captions")):
+        for lang, formats in (info.get(field) or {}).items():
+            if lang == "live_chat":
+                continue
+            subtitle_format = _best_format(formats or [])
+            if subtitle_format is not None:
+                listing[(lang, kind)] = subtitle_format
+    return listing
+
+
+def remember_tracks(video_url: str, info: Dict) -> None:
+    """Keep the track listing of an extraction done elsewhere, so subtitles need no second one."""
+    video_id = extract_video_id(video_url) or video_url
+    _track_listing_cache.put(video_id, track_listing(info))
+
+
+def choose_tracks(
+    listing: Dict[Tuple[str, str], Dict], langs: Sequence[str], max_tracks: int = 1
+) -> List[Tuple[str, str]]:
+    """
+    Pick up to max_tracks (lang, kind) pairs, one per language, in the order of langs.
+    For each language a manual track is preferred over an auto-generated one, and an
+    exact code over a regional variant ('en' matches 'en-GB'). Repeated languages count once.
+    """
+    chosen = []
+    for lang in dict.fromkeys(lang.strip() for lang in langs):
+        candidates = [
+            (code, kind)
+            for kind in (MANUAL, AUTO)
+            for code in sorted(
+                (code for code, track_kind in listing if track_kind == kind),
+                key=lambda code: code != lang,
+            )
+            if code == lang or code.startswith(lang + "-")
+        ]
+        for candidate in candidates:
+            if candidate not in chosen:
+                chosen.append(candidate)
+                break
+        if len(chosen) >= max_tracks:
+            break
+    return chosen
+
+
+def _list_tracks(video_url: str) -> Dict[Tuple[str, str], Dict]:
+    """
+    One yt-dlp extraction, returning every subtitle track of the video.
+    Raises YouTubeNotFound when the video does not exist, any other
+    exception is an upstream failure.
+    """
+    import yt_dlp  # deferred, yt-dlp is slow to import
+
+    ydl_opts = {
+        "skip_download": True,  # Skip downloading the video itself
+        "quiet": True,
+        "no_warnings": True,
+        "socket_timeout": UPSTREAM_TIMEOUT_SECONDS,
+    }
 
     try:
-        ydl_opts = {
-            "writesubtitles": True,
-            "writeautomaticsub": True,
-            "subtitleslangs": [lang],
-            "subtitlesformat": "vtt/srt/best",
-            "skip_download": True,  # Skip downloading the video itself
-            "outtmpl": os.path.join(
-                temp_dir, "%(id)s.%(ext)s"
-            ),  # Save subtitle in temp_dir
-            "quiet": True,
-            "no_warnings": True,
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            logger.info(
-                f"Attempting to download subtitles for {video_url} in lang {lang}"
-            )
-            info = ydl.extract_info(
-                video_url, download=True
-            )  # download=True for subtitles
-
-            requested_subs = info.get("requested_subtitles")
-
-            if requested_subs and lang in requested_subs:
-                subtitle_info = requested_subs[lang]
-                subtitle_file_path = subtitle_info.get("filepath")
-
-                if subtitle_file_path and os.path.exists(subtitle_file_path):
-                    with open(subtitle_file_path, "r", encoding="utf-8") as f:
-                        subtitle_content = f.read()
-                    logger.info(
-                        f"Successfully extracted subtitles from {subtitle_file_path}"
-                    )
-                    return subtitle_content
-
-                elif subtitle_info.get("data"):
-                    logger.info(
-                        f"Extracted subtitles directly from data field for {video_url}"
-                    )
-                    return subtitle_info["data"]
-
-                else:
-                    logger.warning(
-                        f"Subtitle file path not found or file does not exist for lang '{lang}' at '{video_url}'. Path: {subtitle_file_path}"
-                    )
-                    return (
-                        "Subtitles were requested but could not be retrieved from file."
-                    )
-            else:
-                logger.info(
-                    f"No subtitles found or downloaded for language '{lang}' for URL '{video_url}'."
-                )
-                return "Subtitles not available for the specified language or download failed."
+        logger.info(f"Listing subtitle tracks for {video_url}")
+        with upstream_call("youtube"), stage("ytdlp_extract"):
+            info = extract_info(video_url, ydl_opts, process=False)
 
     except yt_dlp.utils.DownloadError as e:
         logger.error(f"yt-dlp DownloadError for subtitles: {e} for URL {video_url}")
 
-        if "video unavailable" in str(e).lower():
-            return "Video unavailable."
+        permanent = permanent_download_error(e)
+        if permanent is not None:
+            raise permanent from e
+        raise
+
+    return track_listing(info)
+
+
+def _download_track(subtitle_format: Dict) -> str:
+    """Fetch a single subtitle track straight from its URL, no temp files involved."""
+    if subtitle_format.get("data"):
+        return subtitle_format["data"]
+
+    import yt_dlp  # deferred, yt-dlp is slow to import
+
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "socket_timeout": UPSTREAM_TIMEOUT_SECONDS,
+    }
+    acquire_upstream("youtube")
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with upstream_call("youtube"), stage("subtitle_download"):
+            response = ydl.urlopen(subtitle_format["url"])
+            try:
+                content = response.read()
+            finally:
+                response.close()
+
+    return content.decode("utf-8", errors="replace")
+
+
+def _needs_download(key: Tuple[str, str, str]) -> bool:
+    """Whether fetching this track will hit the upstream now or in a background refresh."""
+    entry = _subtitle_cache.get(key)
+    if entry is None:
+        return True
+    return not entry[1] and not get_breaker("youtube").is_open
+
+
+def fetch_subtitle_tracks(
+    video_url: str, langs: Sequence[str], max_tracks: int = 1
+) -> Tuple[List[Dict], bool]:
+    """
+    Resolve the best subtitle tracks for an ordered list of languages with at most
+    one extraction, see choose_tracks. Returns ([{lang, kind, content}], is_stale).
+    The track listing and every track are cached separately, with retries,
+    a circuit breaker and the last known good copy as fallback. A stale listing
+    is only used to serve cached tracks, downloads always use a fresh one.
+    Raises YouTubeNotFound, UpstreamUnavailable, AdmissionRejected or the upstream error.
+    """
+    video_id = extract_video_id(video_url) or video_url
+    list_tracks = partial(_list_tracks, video_url)
+    listing, stale = fetch_with_fallback(
+        "youtube",
+        _track_listing_cache,
+        video_id,
+        list_tracks,
+        ignore=(YouTubeNotFound, AdmissionRejected),
+    )
+
+    chosen = choose_tracks(listing, langs, max_tracks)
+    if stale and any(_needs_download((video_id, lang, kind)) for lang, kind in chosen):
+        # the download URLs of a stale listing may have expired, list them again first
+        listing = fetch_fresh(
+            "youtube",
+            _track_listing_cache,
+            video_id,
+            list_tracks,
+            ignore=(YouTubeNotFound, AdmissionRejected),
+        )
+        stale = False
+        chosen = choose_tracks(listing, langs, max_tracks)
+
+    if not chosen:
+        logger.info(
+            f"No subtitles found for languages {', '.join(langs)} for URL '{video_url}'."
+        )
+        raise YouTubeNotFound("Subtitles not available for the specified languages.")
+
+    tracks = []
+    for lang, kind in chosen:
+        subtitle_format = listing[(lang, kind)]
+        content, track_stale = fetch_with_fallback(
+            "youtube",
+            _subtitle_cache,
+            (video_id, lang, kind),
+            # bound now, a background refresh runs after the loop has moved on
+            partial(_download_track, subtitle_format),
+            ignore=(YouTubeNotFound, AdmissionRejected),
+        )
+        stale = stale or track_stale
+        tracks.append({"lang": lang, "kind": kind, "content": content})
+
+    return tracks, stale
+
+
+def fetch_subtitles(video_url: str, lang: str = "en") -> Tuple[str, bool]:
+    """
+    Subtitle content for a video and language, manual before auto-generated.
+    Returns (content, is_stale), see fetch_subtitle_tracks.
+    """
+    tracks, stale = fetch_subtitle_tracks(video_url, [lang])
+    return tracks[0]["content"], stale
 
-        if (
-            "subtitles not available" in str(e).lower()
-            or "no closed captions found" in str(e).lower()
-        ):
-            return "Subtitles not available for the specified language."
 
-        return f"Error downloading subtitles: {str(e)}"
+def get_subtitle_content(video_url: str, lang: str = "en") -> str:
+    """
+    Downloads and extracts subtitle content for a given video URL and language.
+    Failures are returned as a message string, use fetch_subtitles to get exceptions.
+    """
+    try:
+        content, _ = fetch_subtitles(video_url, lang)
+        return content
+
+    except YouTubeNotFound as e:
+        return str(e)
+
+    except (UpstreamUnavailable, AdmissionRejected) as e:
+        return f"Error downloading subtitles: {e}"
 
     except Exception as e:
-        logger.error(f"Error getting subtitle content: {e} for URL {video_url}")
-        return f"An unexpected error occurred while fetching subtitles: {str(e)}"
+        import yt_dlp
 
-    finally:
-        try:
-            if os.path.exists(temp_dir):
-                for f_name in os.listdir(temp_dir):
-                    os.remove(os.path.join(temp_dir, f_name))
-                os.rmdir(temp_dir)
-                logger.info(f"Cleaned up temp directory: {temp_dir}")
+        if isinstance(e, yt_dlp.utils.DownloadError):
+            return f"Error downloading subtitles: {str(e)}"
 
-        except Exception as e_cleanup:
-            logger.error(f"Error cleaning up temp directory {temp_dir}: {e_cleanup}")
+        logger.error(f"Error getting subtitle content: {e} for URL {video_url}")
+        return f"An unexpected error occurred while fetching subtitles: {str(e)}"
@@ -2,21 +2,50 @@
 initalization file for the youtube_agent.transcript_generator module.
 """
 
+from typing import Optional, Tuple
+
+from instrumentation import stage
+
 from .clean import clean_transcript
 from .duplicate import remove_sentence_repeats
+from .pages import CleanedTranscripts, page_transcript, select_time_range
 from .srt import clean_srt_text
 from .timestamp import clean_timestamps_and_dedupe
 
+# cleaned transcripts kept for repeated page requests against the same subtitle file
+_CLEANED_CACHE_SIZE = 16
+
 
 def processed_transcript(text: str) -> str:
     """Process the transcript text by cleaning it up."""
-    cleaned_text = remove_sentence_repeats(
-        clean_timestamps_and_dedupe(clean_srt_text(clean_transcript(text)))
-    )
+    with stage("transcript_clean"):
+        text = clean_transcript(text)
+    with stage("transcript_srt"):
+        text = clean_srt_text(text)
+    with stage("transcript_timestamps"):
+        text = clean_timestamps_and_dedupe(text)
+    with stage("transcript_repeats"):
+        cleaned_text = remove_sentence_repeats(text)
 
     return cleaned_text
 
 
+cleaned_transcripts = CleanedTranscripts(_CLEANED_CACHE_SIZE, processed_transcript)
+
+
+def transcript_page(
+    raw: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+) -> Tuple[str, int, Optional[int]]:
+    """One page of the processed transcript, see page_transcript."""
+    return page_transcript(cleaned_transcripts, raw, offset, limit, start_time, end_time)
+
+
 __all__ = [
     "processed_transcript",
+    "select_time_range",
+    "transcript_page",
 ]
@@ -0,0 +1,87 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from instrumentation import record_cache
+
+
+_CUE_START_PATTERN = re.compile(
+    r"^\s*(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})\s*-->"
+)
+
+
+def _cue_start_seconds(line: str) -> Optional[float]:
+    match = _CUE_START_PATTERN.match(line)
+    if not match:
+        return None
+    hours, minutes, seconds, millis = match.groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+
+def select_time_range(raw: str, start: float = 0, end: Optional[float] = None) -> str:
+    """
+    Keep only the cues of a VTT/SRT subtitle file that start inside [start, end) seconds.
+    Everything before the first cue (headers, metadata) is dropped.
+    """
+    lines = []
+    keep = False
+    for line in raw.splitlines():
+        cue_start = _cue_start_seconds(line)
+        if cue_start is not None:
+            keep = cue_start >= start and (end is None or cue_start < end)
+        if keep:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+class CleanedTranscripts:
+    """
+    Small LRU of cleaned transcripts keyed by the raw subtitle text, so paging
+    through a transcript cleans it once rather than once per page.
+    """
+
+    def __init__(self, size: int, clean: Callable[[str], str]):
+        self.size = size
+        self.clean = clean
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, raw: str) -> str:
+        with self._lock:
+            cleaned = self._entries.get(raw)
+            if cleaned is not None:
+                self._entries.move_to_end(raw)
+        record_cache("cleaned_transcript", cleaned is not None)
+        if cleaned is not None:
+            return cleaned
+
+        cleaned = self.clean(raw)
+        with self._lock:
+            self._entries[raw] = cleaned
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return cleaned
+
+
+def page_transcript(
+    cleaned: CleanedTranscripts,
+    raw: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+) -> Tuple[str, int, Optional[int]]:
+    """
+    Clean a subtitle file and return one page of it as (text, total_length, next_offset).
+    The time range selects cues before cleaning, offset and limit are character
+    positions in the cleaned text of that range. next_offset is None on the last page.
+    """
+    if start_time is not None or end_time is not None:
+        raw = select_time_range(raw, start_time or 0, end_time)
+
+    text = cleaned.get(raw)
+    total_length = len(text)
+    end = total_length if limit is None else min(total_length, offset + limit)
+    next_offset = end if end < total_length else None
+    return text[offset:end], total_length, next_offset
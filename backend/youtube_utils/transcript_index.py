@@ -0,0 +1,20 @@
+from typing import List
+
+
+def transcript_source(video_id: str) -> str:
+    return f"youtube:{video_id}"
+
+
+def index_transcript(video_id: str, transcript: str) -> str:
+    """Store a cleaned transcript with its retrieval chunks, returns the doc store digest."""
+    from doc_analyser import ingest_text  # deferred, pulls in langchain
+
+    return ingest_text(transcript, transcript_source(video_id))
+
+
+def relevant_passages(video_id: str, transcript: str, question: str, k: int = 4) -> List[str]:
+    """The k transcript chunks most relevant to the question, indexing it on first use."""
+    from doc_analyser import open_text, retrieve  # deferred, pulls in langchain
+
+    document = open_text(transcript, transcript_source(video_id))
+    return [chunk.page_content for chunk in retrieve(document, question, k)]